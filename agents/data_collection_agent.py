@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Dict, Any, Optional
 from contextlib import contextmanager
@@ -26,20 +27,28 @@ class DataCollectionAgent(BaseAgent):
             self.db.session.rollback()
             raise e
 
+    def _store_price_data(self, hourly_data: Dict[str, Any]) -> None:
+        """Store price data in database using PriceHistory model (runs in a worker thread)"""
+        from app import app  # Import here to avoid circular dependency
+
+        # A fresh app context gives this thread its own scoped session, removed on exit
+        with app.app_context(), self.db_session():
+            # db_session commits on exit, so skip the per-insert commit
+            PriceHistory.add_price_data(
+                hourly_price=float(hourly_data.get('price', 0)),
+                day_ahead_price=float(hourly_data.get('day_ahead_price', 0)) if 'day_ahead_price' in hourly_data else None,
+                commit=False
+            )
+            logger.info(f"Stored price data: {hourly_data}")
+
     async def process(self, message: Message) -> Optional[Message]:
         """Process incoming messages and handle price data collection"""
         if message.payload.get("command") == "fetch_prices":
             try:
                 hourly_data = await self.price_monitor.check_hourly_price()
 
-                # Store price data in database using PriceHistory model
-                with self.db_session() as session:
-                    price_record = PriceHistory(
-                        hourly_price=float(hourly_data.get('price', 0)),
-                        day_ahead_price=float(hourly_data.get('day_ahead_price', 0)) if 'day_ahead_price' in hourly_data else None
-                    )
-                    session.add(price_record)
-                    logger.info(f"Stored price data: {hourly_data}")
+                # Store price data in database without blocking the event loop
+                await asyncio.to_thread(self._store_price_data, hourly_data)
 
                 return Message(
                     msg_type=MessageType.RESPONSE,
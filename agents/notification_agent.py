@@ -1,16 +1,18 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent
 from telegram.ext import Application
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 import os
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from models import PriceHistory
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_DRAIN_WINDOW = 0.1  # Seconds to gather queued notifications before storing them as one batch
+
 class NotificationAgent(BaseAgent):
     def __init__(self):
         super().__init__("Notification")
@@ -18,6 +20,7 @@ class NotificationAgent(BaseAgent):
         self.bot_token = os.environ.get("TELEGRAM_BOT_TOKEN")
         self.chat_id = os.environ.get("TELEGRAM_CHAT_ID")
         self.bot = None
+        self._drain_task: Optional[asyncio.Task] = None
 
     async def start(self):
         """Initialize the Telegram bot when starting the agent"""
@@ -53,20 +56,55 @@ class NotificationAgent(BaseAgent):
 
     async def queue_notification(self, notification_data: Dict[str, Any]) -> None:
         self.notification_queue.append(notification_data)
-        await self.process_queue()
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain_queue())
+
+    async def _drain_queue(self) -> None:
+        """Wait out the drain window so a burst of notifications is stored with one commit, then send them"""
+        await asyncio.sleep(NOTIFICATION_DRAIN_WINDOW)
+        try:
+            await self.process_queue()
+        except Exception as e:
+            logger.error(f"Error processing notification queue: {str(e)}")
+
+    @staticmethod
+    def _needs_price_record(notification: Dict[str, Any]) -> bool:
+        """Whether a notification carries a prediction that has not been stored yet"""
+        return bool(notification.get("prediction", {}).get("short_term_prediction")) and "price_record_id" not in notification
+
+    def store_predictions(self, notifications: List[Dict[str, Any]]) -> None:
+        """Store predictions for queued notifications in a single transaction"""
+        pending = [notification for notification in notifications if self._needs_price_record(notification)]
+        if not pending:
+            return
 
-    def store_prediction(self, price_data: Dict[str, Any], prediction: Dict[str, Any]) -> int:
-        """Store prediction in database"""
         from app import app  # Import here to avoid circular dependency
+        from database import db
 
         with app.app_context():
-            price_record = PriceHistory(
-                hourly_price=price_data["hourly_data"]["price"],
-                predicted_price=prediction["short_term_prediction"],
-                prediction_confidence=prediction["confidence"]
-            )
-            price_record.save()
-            return price_record.id
+            try:
+                # Rows are unique per (provider, timestamp), so space the batch a microsecond apart
+                stored_at = datetime.utcnow()
+                records = [
+                    PriceHistory(
+                        provider="ComEd",
+                        timestamp=stored_at + timedelta(microseconds=i),
+                        hourly_price=notification["price_data"]["hourly_data"]["price"],
+                        predicted_price=notification["prediction"]["short_term_prediction"],
+                        prediction_confidence=notification["prediction"]["confidence"]
+                    )
+                    for i, notification in enumerate(pending)
+                ]
+                db.session.add_all(records)
+                db.session.flush()  # Assign ids before the single commit
+                for notification, record in zip(pending, records):
+                    notification["price_record_id"] = record.id
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Error storing predictions: {str(e)}")
+                db.session.rollback()
+                for notification in pending:
+                    notification.pop("price_record_id", None)
 
     async def process_queue(self) -> None:
         if not self.bot:
@@ -74,15 +112,14 @@ class NotificationAgent(BaseAgent):
             return
 
         while self.notification_queue:
+            # Store predictions for everything queued so far with one commit, off the event loop;
+            # notifications queued while earlier ones were being sent are picked up here too
+            if self._needs_price_record(self.notification_queue[0]):
+                await asyncio.to_thread(self.store_predictions, list(self.notification_queue))
+
             notification = self.notification_queue.pop(0)
             try:
-                price_record_id = None
-                # Store prediction in database first if available
-                if notification.get("prediction", {}).get("short_term_prediction"):
-                    price_record_id = self.store_prediction(
-                        notification["price_data"],
-                        notification["prediction"]
-                    )
+                price_record_id = notification.get("price_record_id")
 
                 # Format message with price data, analysis, and predictions
                 message = self._format_notification_message(
@@ -1,5 +1,8 @@
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 from .base_agent import BaseAgent
@@ -7,45 +10,36 @@ from models import PriceHistory
 
 logger = logging.getLogger(__name__)
 
+MAX_WINDOW_SIZE = 12  # Hours of data used for the weighted moving average
+PREDICTION_CACHE_TTL = 300  # Seconds a prediction is reused (matches the 5-minute price feed)
+
+@lru_cache(maxsize=8)
+def _exponential_weights(decay: float) -> np.ndarray:
+    """Precompute exponential decay weights for the full averaging window"""
+    weights = np.exp(-np.arange(MAX_WINDOW_SIZE) * decay)
+    weights.flags.writeable = False
+    return weights
+
 class PricePredictionAgent(BaseAgent):
     def __init__(self):
         super().__init__("PricePrediction")
         self.min_history_points = 6  # Minimum data points needed for prediction
         self.provider = "ComEd"  # Default provider
+        self._prediction_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
 
     async def process(self, message: Dict[str, Any]) -> Dict[str, Any]:
         if message.get("command") == "predict_prices":
             try:
-                # Get historical data from database using Flask application context
-                from app import app  # Import here to avoid circular dependency
-
-                with app.app_context():
-                    historical_records = PriceHistory.get_recent_history(hours=24, provider=self.provider)
-                    feedback_records = PriceHistory.get_recent_predictions_with_accuracy(provider=self.provider)
-
-                if not historical_records or len(historical_records) < self.min_history_points:
-                    logger.warning(f"Limited historical data. Using basic prediction with {len(historical_records) if historical_records else 0} points.")
-                    return {
-                        "status": "success",
-                        "predictions": self.get_limited_prediction(historical_records)
-                    }
-
-                predictions = self.predict_future_prices(historical_records, feedback_records)
-
-                # Store prediction in database
-                with app.app_context():
-                    if historical_records:
-                        current_price = historical_records[0].hourly_price
-                        PriceHistory.add_price_data(
-                            hourly_price=current_price,
-                            predicted_price=predictions["short_term_prediction"],
-                            prediction_confidence=predictions["confidence"],
-                            provider=self.provider
-                        )
-
+                # Reuse the prediction computed in the current 5-minute bucket
+                cache_key = (self.provider, int(time.time() // PREDICTION_CACHE_TTL))
+                predictions = self._prediction_cache.get(cache_key)
+                if predictions is None:
+                    # Database work is blocking, so keep it off the event loop
+                    predictions = await asyncio.to_thread(self._predict_and_store)
+                    self._prediction_cache = {cache_key: predictions}  # Drop stale buckets
                 return {
                     "status": "success",
-                    "predictions": predictions
+                    "predictions": dict(predictions)
                 }
             except Exception as e:
                 logger.error(f"Error predicting prices: {str(e)}")
@@ -58,16 +52,44 @@ class PricePredictionAgent(BaseAgent):
             "message": "Unknown command"
         }
 
-    def predict_future_prices(self, historical_records: List[PriceHistory], feedback_records: List[PriceHistory]) -> Dict[str, Any]:
-        """Predict future prices using historical data and feedback from database"""
-        # Extract price data
-        prices = [record.hourly_price for record in historical_records if record.hourly_price is not None]
+    def _predict_and_store(self) -> Dict[str, Any]:
+        """Read history, predict and store within a single context and transaction"""
+        from app import app  # Import here to avoid circular dependency
+
+        with app.app_context():
+            prices = PriceHistory.get_recent_prices(hours=24, provider=self.provider)
+            feedback_records = PriceHistory.get_recent_predictions_with_accuracy(provider=self.provider)
+
+            if len(prices) < self.min_history_points:
+                logger.warning(f"Limited historical data. Using basic prediction with {len(prices)} points.")
+                return self.get_limited_prediction(prices)
+
+            predictions = self.predict_future_prices(prices, feedback_records)
 
-        if not prices:
-            return self.get_limited_prediction([])
+            # Store prediction in database
+            current_price = prices[0]
+            PriceHistory.add_price_data(
+                hourly_price=current_price,
+                predicted_price=predictions["short_term_prediction"],
+                prediction_confidence=predictions["confidence"],
+                provider=self.provider
+            )
+            return predictions
+
+    def predict_future_prices(self, prices: List[float], feedback_records: List[PriceHistory]) -> Dict[str, Any]:
+        """Predict future prices using historical prices (newest first) and feedback from database"""
+        if len(prices) <= 1:
+            # Nothing to average or trend over; skip the NumPy work entirely
+            return self.get_limited_prediction(prices)
+
+        # Fill one float64 buffer up front instead of converting the list in every helper
+        prices = np.fromiter(prices, dtype=np.float64, count=len(prices))
+
+        # Average feedback accuracy once and reuse it for weights and confidence
+        avg_accuracy = self._average_accuracy(feedback_records)
 
         # Calculate moving averages with feedback adjustment
-        prediction_weights = self.calculate_prediction_weights(feedback_records)
+        prediction_weights = self.calculate_prediction_weights(avg_accuracy)
         weighted_ma = self._calculate_weighted_moving_average(prices, prediction_weights)
 
         # Calculate trend and momentum
@@ -78,31 +100,36 @@ class PricePredictionAgent(BaseAgent):
         base_prediction = weighted_ma * (1 + momentum)
 
         # Adjust prediction based on feedback accuracy
-        avg_accuracy = float(np.mean([record.prediction_accuracy for record in feedback_records])) if feedback_records else 0.7
-        confidence_factor = min(avg_accuracy * 1.2, 1.0)  # Scale up accuracy but cap at 1.0
+        confidence_factor = min((avg_accuracy if avg_accuracy is not None else 0.7) * 1.2, 1.0)  # Scale up accuracy but cap at 1.0
 
         # Calculate final prediction and confidence
         final_prediction = float(base_prediction * (1 + (momentum * confidence_factor)))  # Convert to float
-        confidence = float(self._calculate_confidence(prices, feedback_records))  # Convert to float
+        confidence = float(self._calculate_confidence(prices, avg_accuracy))  # Convert to float
 
         return {
             "short_term_prediction": round(final_prediction, 2),
             "confidence": round(confidence, 1),
             "trend": trend,
-            "feedback_quality": round(float(avg_accuracy * 100), 1) if feedback_records else None
+            "feedback_quality": round(avg_accuracy * 100, 1) if avg_accuracy is not None else None
         }
 
-    def calculate_prediction_weights(self, feedback_records: List[PriceHistory]) -> Dict[str, float]:
+    @staticmethod
+    def _average_accuracy(feedback_records: List[PriceHistory]) -> Optional[float]:
+        """Average the recorded prediction accuracy in a single pass, None without feedback"""
+        total = 0.0
+        count = 0
+        for record in feedback_records:
+            accuracy = record.prediction_accuracy
+            if accuracy is not None:
+                total += accuracy
+                count += 1
+        return total / count if count else None
+
+    def calculate_prediction_weights(self, avg_accuracy: Optional[float]) -> Dict[str, float]:
         """Calculate prediction weights based on historical accuracy"""
-        if not feedback_records:
-            return {"trend": 0.4, "momentum": 0.3, "historical": 0.3}
-
-        accuracies = [record.prediction_accuracy for record in feedback_records if record.prediction_accuracy is not None]
-        if not accuracies:
+        if avg_accuracy is None:
             return {"trend": 0.4, "momentum": 0.3, "historical": 0.3}
 
-        avg_accuracy = np.mean(accuracies)
-
         # Adjust weights based on historical accuracy
         if avg_accuracy > 0.8:
             return {"trend": 0.5, "momentum": 0.3, "historical": 0.2}
@@ -113,45 +140,41 @@ class PricePredictionAgent(BaseAgent):
 
     def _calculate_weighted_moving_average(self, prices: List[float], weights: Dict[str, float]) -> float:
         """Calculate weighted moving average based on feedback-adjusted weights"""
-        if not prices:
+        if len(prices) == 0:
             return 0.0
 
-        window_size = min(len(prices), 12)  # Use up to 12 hours of data
-        recent_prices = prices[:window_size]
+        window_size = min(len(prices), MAX_WINDOW_SIZE)  # Use up to 12 hours of data
+        recent_prices = np.asarray(prices[:window_size], dtype=np.float64)
 
-        # Apply exponential weights that sum to 1
-        exp_weights = np.exp(-np.arange(len(recent_prices)) * weights["historical"])
-        exp_weights = exp_weights / exp_weights.sum()
+        # Slice the cached weights to the window and renormalize so they sum to 1
+        exp_weights = _exponential_weights(weights["historical"])[:window_size]
 
-        return np.average(recent_prices, weights=exp_weights)
+        return float(recent_prices @ exp_weights / exp_weights.sum())
 
     def _calculate_momentum(self, prices: List[float]) -> float:
         """Calculate price momentum"""
         if len(prices) < 2:
             return 0.0
 
-        recent_changes = np.diff(prices[:12] if len(prices) >= 12 else prices)
+        recent_changes = np.diff(prices[:MAX_WINDOW_SIZE])
         return np.mean(recent_changes) / prices[0] if prices[0] != 0 else 0.0
 
     def _determine_trend(self, prices: List[float], weighted_ma: float) -> str:
         """Determine price trend using weighted moving average"""
-        if not prices:
+        if len(prices) == 0:
             return "unknown"
 
         current_price = prices[0]
         return "rising" if current_price > weighted_ma else "falling" if current_price < weighted_ma else "stable"
 
-    def _calculate_confidence(self, prices: List[float], feedback_records: List[PriceHistory]) -> float:
+    def _calculate_confidence(self, prices: List[float], avg_accuracy: Optional[float]) -> float:
         """Calculate prediction confidence based on historical accuracy and current market conditions"""
-        if not prices or not feedback_records:
+        if len(prices) == 0 or avg_accuracy is None:
             return 50.0  # Base confidence
 
         # Calculate volatility
-        volatility = np.std(prices) / np.mean(prices) if np.mean(prices) != 0 else 0.1
-
-        # Get average historical accuracy
-        accuracies = [record.prediction_accuracy for record in feedback_records if record.prediction_accuracy is not None]
-        avg_accuracy = np.mean(accuracies) if accuracies else 0.7
+        mean_price = np.mean(prices)
+        volatility = np.std(prices) / mean_price if mean_price != 0 else 0.1
 
         # Base confidence starts at 50
         confidence = 50.0
@@ -167,19 +190,9 @@ class PricePredictionAgent(BaseAgent):
 
         return min(max(confidence, 0), 100)  # Ensure confidence is between 0 and 100
 
-    def get_limited_prediction(self, historical_records: List[PriceHistory]) -> Dict[str, Any]:
+    def get_limited_prediction(self, prices: List[float]) -> Dict[str, Any]:
         """Generate a basic prediction with limited data"""
-        if not historical_records:
-            return {
-                "short_term_prediction": None,
-                "confidence": 0,
-                "trend": "unknown",
-                "feedback_quality": None
-            }
-
-        prices = [record.hourly_price for record in historical_records if record.hourly_price is not None]
-
-        if not prices:
+        if len(prices) == 0:
             return {
                 "short_term_prediction": None,
                 "confidence": 0,
@@ -188,8 +201,13 @@ class PricePredictionAgent(BaseAgent):
             }
 
         current_price = prices[0]
-        avg_price = np.mean(prices)
-        trend = "rising" if current_price > avg_price else "falling" if current_price < avg_price else "stable"
+        if len(prices) == 1:
+            # A single point is its own average
+            trend = "stable"
+        else:
+            # Too few points to be worth NumPy array setup
+            avg_price = sum(prices) / len(prices)
+            trend = "rising" if current_price > avg_price else "falling" if current_price < avg_price else "stable"
 
         return {
             "short_term_prediction": round(current_price * (1.02 if trend == "rising" else 0.98 if trend == "falling" else 1.0), 2),
@@ -220,6 +220,7 @@ class TeslaChargingAgent(BaseAgent):
 
             results = []
             current_price = price_data.get('hourly_data', {}).get('price', 0)
+            now = datetime.now()  # One clock read for every vehicle in this tick
 
             for prefs in active_preferences:
                 try:
@@ -230,7 +231,7 @@ class TeslaChargingAgent(BaseAgent):
 
                     prefs.update_vehicle_status(vehicle_data)
 
-                    should_start = prefs.should_start_charging(current_price)
+                    should_start = prefs.should_start_charging(current_price, now)
                     should_stop = prefs.should_stop_charging(current_price)
                     current_state = vehicle_data['charging_state']
 
@@ -30,6 +30,12 @@ try:
         "pool_recycle": 300,
         "pool_pre_ping": True,
     }
+    # Size the pool for concurrent bot handlers (SQLite manages its own pool)
+    if not (app.config["SQLALCHEMY_DATABASE_URI"] or "").startswith("sqlite"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"].update({
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", "20")),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", "40")),
+        })
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     # Register Jinja2 filters
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, configure_mappers
 import logging
 from flask import Flask, current_app
 
@@ -20,6 +20,8 @@ def init_db(app: Flask):
         with app.app_context():
             logger.info("Creating database tables...")
             import models  # Import here to avoid circular imports
+            # Configure all mappers now so registry errors surface once at startup
+            configure_mappers()
             db.create_all()
             logger.info("Database tables created successfully")
 
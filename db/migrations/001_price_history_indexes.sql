@@ -0,0 +1,11 @@
+-- Indexes for price_history recent-history lookups
+-- New databases get these from db.create_all(); run this script once on existing ones.
+
+CREATE INDEX IF NOT EXISTS ix_price_history_timestamp
+    ON price_history (timestamp);
+
+CREATE INDEX IF NOT EXISTS ix_price_history_provider_ts
+    ON price_history (provider, timestamp);
+
+CREATE INDEX IF NOT EXISTS ix_price_history_pred_acc_ts
+    ON price_history (prediction_accuracy, timestamp);
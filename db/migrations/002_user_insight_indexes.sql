@@ -0,0 +1,10 @@
+-- Composite (chat_id, timestamp) indexes for per-user insight and analytics lookups
+-- New databases get these from db.create_all(); run this script once on existing ones.
+-- CONCURRENTLY avoids blocking writes on PostgreSQL but cannot run inside a
+-- transaction, so execute it with autocommit (e.g. plain psql -f).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_savings_insight_chat_ts
+    ON savings_insight (chat_id, timestamp DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_user_analytics_chat_ts
+    ON user_analytics (chat_id, timestamp);
@@ -0,0 +1,20 @@
+-- Hourly prediction feedback sums backing PriceHistory.get_prediction_feedback_stats (PostgreSQL only)
+-- Superseded by 006_prediction_feedback_running_sums.sql, which drops this view.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_prediction_feedback_stats AS
+SELECT
+    provider,
+    date_trunc('hour', timestamp) AS bucket,
+    COUNT(*) AS n,
+    SUM(prediction_accuracy) AS sum_acc,
+    SUM(COALESCE(prediction_confidence, 0)) AS sum_conf,
+    SUM(prediction_accuracy * COALESCE(prediction_confidence, 0)) AS sum_ac,
+    SUM(prediction_accuracy * prediction_accuracy) AS sum_a2,
+    SUM(COALESCE(prediction_confidence, 0) * COALESCE(prediction_confidence, 0)) AS sum_c2
+FROM price_history
+WHERE prediction_accuracy IS NOT NULL
+GROUP BY 1, 2;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_prediction_feedback_stats_provider_bucket
+    ON mv_prediction_feedback_stats (provider, bucket);
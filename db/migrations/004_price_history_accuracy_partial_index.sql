@@ -0,0 +1,10 @@
+-- Partial index over rows with prediction feedback, replacing ix_price_history_pred_acc_ts
+-- New databases get this from db.create_all(); run this script once on existing ones.
+-- CONCURRENTLY avoids blocking writes on PostgreSQL but cannot run inside a
+-- transaction, so execute it with autocommit (e.g. plain psql -f).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_price_history_provider_ts_has_accuracy
+    ON price_history (provider, timestamp DESC)
+    WHERE prediction_accuracy IS NOT NULL;
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_price_history_pred_acc_ts;
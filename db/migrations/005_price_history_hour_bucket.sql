@@ -0,0 +1,11 @@
+-- Generated hour bucket for price_history range scans (PostgreSQL)
+-- New databases get this from db.create_all(); run this script once on existing ones.
+-- Adding a STORED generated column rewrites the table; the index is built
+-- CONCURRENTLY afterwards, so execute the script with autocommit (e.g. plain psql -f).
+
+ALTER TABLE price_history
+    ADD COLUMN IF NOT EXISTS ts_hour timestamp
+    GENERATED ALWAYS AS (date_trunc('hour', timestamp)) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_price_history_provider_hour_ts
+    ON price_history (provider, ts_hour, timestamp);
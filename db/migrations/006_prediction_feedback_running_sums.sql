@@ -0,0 +1,82 @@
+-- Running prediction feedback sums backing PriceHistory.get_prediction_feedback_stats (PostgreSQL only)
+-- Replaces the mv_prediction_feedback_stats materialized view from 003: a trigger keeps
+-- the hourly sums current as feedback arrives, so no periodic refresh is needed.
+-- Run this script once, in a single transaction (e.g. psql -1 -f).
+
+CREATE TABLE IF NOT EXISTS prediction_feedback_running (
+    provider varchar(50) NOT NULL,
+    bucket timestamp NOT NULL,
+    n bigint NOT NULL DEFAULT 0,
+    sum_acc double precision NOT NULL DEFAULT 0,
+    sum_conf double precision NOT NULL DEFAULT 0,
+    sum_ac double precision NOT NULL DEFAULT 0,
+    sum_a2 double precision NOT NULL DEFAULT 0,
+    sum_c2 double precision NOT NULL DEFAULT 0,
+    PRIMARY KEY (provider, bucket)
+);
+
+CREATE OR REPLACE FUNCTION price_history_feedback_running() RETURNS trigger AS $$
+DECLARE
+    conf double precision;
+BEGIN
+    -- Remove the old row's contribution
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.prediction_accuracy IS NOT NULL THEN
+        conf := COALESCE(OLD.prediction_confidence, 0);
+        UPDATE prediction_feedback_running SET
+            n = n - 1,
+            sum_acc = sum_acc - OLD.prediction_accuracy,
+            sum_conf = sum_conf - conf,
+            sum_ac = sum_ac - OLD.prediction_accuracy * conf,
+            sum_a2 = sum_a2 - OLD.prediction_accuracy * OLD.prediction_accuracy,
+            sum_c2 = sum_c2 - conf * conf
+        WHERE provider = OLD.provider AND bucket = date_trunc('hour', OLD.timestamp);
+    END IF;
+
+    -- Add the new row's contribution
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.prediction_accuracy IS NOT NULL THEN
+        conf := COALESCE(NEW.prediction_confidence, 0);
+        INSERT INTO prediction_feedback_running AS r
+            (provider, bucket, n, sum_acc, sum_conf, sum_ac, sum_a2, sum_c2)
+        VALUES (
+            NEW.provider, date_trunc('hour', NEW.timestamp), 1,
+            NEW.prediction_accuracy, conf, NEW.prediction_accuracy * conf,
+            NEW.prediction_accuracy * NEW.prediction_accuracy, conf * conf
+        )
+        ON CONFLICT (provider, bucket) DO UPDATE SET
+            n = r.n + 1,
+            sum_acc = r.sum_acc + EXCLUDED.sum_acc,
+            sum_conf = r.sum_conf + EXCLUDED.sum_conf,
+            sum_ac = r.sum_ac + EXCLUDED.sum_ac,
+            sum_a2 = r.sum_a2 + EXCLUDED.sum_a2,
+            sum_c2 = r.sum_c2 + EXCLUDED.sum_c2;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_price_history_feedback_running ON price_history;
+CREATE TRIGGER trg_price_history_feedback_running
+    AFTER INSERT OR DELETE
+        OR UPDATE OF prediction_accuracy, prediction_confidence, provider, timestamp
+    ON price_history
+    FOR EACH ROW EXECUTE FUNCTION price_history_feedback_running();
+
+-- Backfill from existing feedback
+TRUNCATE prediction_feedback_running;
+INSERT INTO prediction_feedback_running
+    (provider, bucket, n, sum_acc, sum_conf, sum_ac, sum_a2, sum_c2)
+SELECT
+    provider,
+    date_trunc('hour', timestamp),
+    COUNT(*),
+    SUM(prediction_accuracy),
+    SUM(COALESCE(prediction_confidence, 0)),
+    SUM(prediction_accuracy * COALESCE(prediction_confidence, 0)),
+    SUM(prediction_accuracy * prediction_accuracy),
+    SUM(COALESCE(prediction_confidence, 0) * COALESCE(prediction_confidence, 0))
+FROM price_history
+WHERE prediction_accuracy IS NOT NULL
+GROUP BY 1, 2;
+
+DROP MATERIALIZED VIEW IF EXISTS mv_prediction_feedback_stats;
@@ -0,0 +1,23 @@
+-- Move Tesla OAuth tokens out of tesla_preferences into their own table
+-- New databases get this from db.create_all(); run this script once on existing ones,
+-- in a single transaction (e.g. psql -1 -f).
+
+CREATE TABLE IF NOT EXISTS tesla_tokens (
+    chat_id varchar(100) PRIMARY KEY REFERENCES user_preferences (chat_id),
+    access_token varchar(500),
+    refresh_token varchar(500),
+    token_expiry timestamp,
+    updated_at timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+INSERT INTO tesla_tokens (chat_id, access_token, refresh_token, token_expiry)
+SELECT DISTINCT ON (chat_id) chat_id, access_token, refresh_token, token_expiry
+FROM tesla_preferences
+WHERE access_token IS NOT NULL OR refresh_token IS NOT NULL
+ORDER BY chat_id, updated_at DESC
+ON CONFLICT (chat_id) DO NOTHING;
+
+ALTER TABLE tesla_preferences
+    DROP COLUMN IF EXISTS access_token,
+    DROP COLUMN IF EXISTS refresh_token,
+    DROP COLUMN IF EXISTS token_expiry;
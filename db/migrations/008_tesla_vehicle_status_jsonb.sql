@@ -0,0 +1,12 @@
+-- Store Tesla vehicle status as JSONB with generated typed columns (PostgreSQL)
+-- New databases get this from db.create_all(); run this script once on existing ones,
+-- in a single transaction (e.g. psql -1 -f).
+
+ALTER TABLE tesla_preferences
+    ALTER COLUMN last_vehicle_status TYPE jsonb USING last_vehicle_status::jsonb;
+
+ALTER TABLE tesla_preferences
+    ADD COLUMN IF NOT EXISTS battery_level smallint
+        GENERATED ALWAYS AS (((last_vehicle_status ->> 'battery_level')::numeric::smallint)) STORED,
+    ADD COLUMN IF NOT EXISTS charging_state varchar(32)
+        GENERATED ALWAYS AS ((last_vehicle_status ->> 'charging_state')) STORED;
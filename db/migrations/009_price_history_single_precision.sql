@@ -0,0 +1,12 @@
+-- Store price_history prices as single precision (PostgreSQL real, 4 bytes each)
+-- New databases get this from db.create_all(); run this script once on existing ones,
+-- in a single transaction (e.g. psql -1 -f). The table is rewritten, so run it off-peak.
+-- The feedback running sums from 006 stay double precision.
+
+ALTER TABLE price_history
+    ALTER COLUMN hourly_price TYPE real,
+    ALTER COLUMN hourly_average TYPE real,
+    ALTER COLUMN day_ahead_price TYPE real,
+    ALTER COLUMN predicted_price TYPE real,
+    ALTER COLUMN prediction_accuracy TYPE real,
+    ALTER COLUMN prediction_confidence TYPE real;
@@ -0,0 +1,28 @@
+-- Make (provider, timestamp) unique on price_history so ticks can be upserted
+-- New databases get this from db.create_all(); run this script once on existing ones.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so do not use psql -1.
+
+-- Keep one row of each duplicated tick: the newest one carrying user feedback,
+-- or the newest one when none of them has feedback
+DELETE FROM price_history
+WHERE id IN (
+    SELECT id
+    FROM (
+        SELECT id,
+               row_number() OVER (
+                   PARTITION BY provider, timestamp
+                   ORDER BY (prediction_accuracy IS NOT NULL) DESC, id DESC
+               ) AS keep_rank
+        FROM price_history
+    ) ranked
+    WHERE keep_rank > 1
+);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_price_history_provider_ts
+    ON price_history (provider, timestamp);
+
+ALTER TABLE price_history
+    ADD CONSTRAINT uq_price_history_provider_ts UNIQUE USING INDEX uq_price_history_provider_ts;
+
+-- The unique index covers the same (provider, timestamp) lookups
+DROP INDEX CONCURRENTLY IF EXISTS ix_price_history_provider_ts;
@@ -0,0 +1,22 @@
+-- Key daily user_analytics rows on an explicit date column
+-- New databases get this from db.create_all(); run this script once on existing ones,
+-- in a single transaction (e.g. psql -1 -f).
+
+ALTER TABLE user_analytics ADD COLUMN IF NOT EXISTS analytics_date date;
+
+UPDATE user_analytics SET analytics_date = timestamp::date WHERE analytics_date IS NULL;
+
+-- Keep the most recently updated row for each chat and day
+DELETE FROM user_analytics a
+USING user_analytics newer
+WHERE newer.chat_id = a.chat_id
+  AND newer.analytics_date = a.analytics_date
+  AND (newer.timestamp, newer.id) > (a.timestamp, a.id);
+
+ALTER TABLE user_analytics ALTER COLUMN analytics_date SET NOT NULL;
+
+ALTER TABLE user_analytics
+    ADD CONSTRAINT uq_user_analytics_chat_date UNIQUE (chat_id, analytics_date);
+
+-- The unique constraint's index covers per-chat lookups
+DROP INDEX IF EXISTS ix_user_analytics_chat_ts;
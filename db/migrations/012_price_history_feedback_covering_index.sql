@@ -0,0 +1,16 @@
+-- Covering partial index for prediction feedback reads, replacing
+-- ix_price_history_provider_ts_has_accuracy from 004
+-- New databases get this from db.create_all(); run this script once on existing ones.
+-- CONCURRENTLY avoids blocking writes on PostgreSQL but cannot run inside a
+-- transaction, so execute it with autocommit (e.g. plain psql -f).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_price_history_provider_ts_feedback_covering
+    ON price_history (provider, timestamp DESC)
+    INCLUDE (prediction_accuracy, prediction_confidence)
+    WHERE prediction_accuracy IS NOT NULL;
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_price_history_provider_ts_has_accuracy;
+
+-- Index-only scans need an up-to-date visibility map; autovacuum keeps it fresh
+-- afterwards, so vacuum once now rather than waiting for the first autovacuum.
+VACUUM (ANALYZE) price_history;
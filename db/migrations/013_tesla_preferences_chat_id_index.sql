@@ -0,0 +1,7 @@
+-- Index tesla_preferences.chat_id, which every per-chat Tesla preferences lookup filters on
+-- New databases get this from db.create_all(); run this script once on existing ones.
+-- CONCURRENTLY avoids blocking writes on PostgreSQL but cannot run inside a
+-- transaction, so execute it with autocommit (e.g. plain psql -f).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tesla_preferences_chat_id
+    ON tesla_preferences (chat_id);
@@ -13,6 +13,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Display timezone, resolved once at import
+CST = ZoneInfo("America/Chicago")
+
 # Get bot token from environment
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
 if not TELEGRAM_BOT_TOKEN:
@@ -45,7 +48,7 @@ async def check_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "📊 Energy Price Update\n\n"
             f"Current Price: {current_price}¢\n"
             f"Status: Testing Mode\n\n"
-            f"⏰ Updated: {datetime.now(ZoneInfo('America/Chicago')).strftime('%I:%M %p %Z')}"
+            f"⏰ Updated: {datetime.now(CST).strftime('%I:%M %p %Z')}"
         )
         await update.message.reply_text(message)
             
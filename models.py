@@ -1,9 +1,89 @@
+import math
+import logging
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from database import db
-from typing import List, Optional, TYPE_CHECKING
-import numpy as np
+from typing import List, Optional, Tuple
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func, lambda_stmt, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+
+logger = logging.getLogger(__name__)
+
+def _recent_window(delta: timedelta) -> Tuple[datetime, datetime]:
+    """Return a half-open [now - delta, now) range with now captured once"""
+    now = datetime.utcnow()
+    return now - delta, now
+
+class hour_bucket(FunctionElement):
+    """SQL expression truncating a timestamp to the start of its hour"""
+    type = db.DateTime()
+    name = "hour_bucket"
+    inherit_cache = True
+
+@compiles(hour_bucket)
+def _compile_hour_bucket(element, compiler, **kw):
+    return f"date_trunc('hour', {compiler.process(element.clauses, **kw)})"
+
+@compiles(hour_bucket, "sqlite")
+def _compile_hour_bucket_sqlite(element, compiler, **kw):
+    # Same text layout as SQLite's bound DateTime parameters, so string comparisons line up
+    return f"strftime('%Y-%m-%d %H:00:00.000000', {compiler.process(element.clauses, **kw)})"
+
+class json_field(FunctionElement):
+    """SQL expression reading a top-level key of a JSON column, optionally as an integer"""
+    name = "json_field"
+    inherit_cache = True
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ("key", InternalTraversal.dp_string),
+        ("as_integer", InternalTraversal.dp_boolean),
+    ]
+
+    def __init__(self, column, key: str, as_integer: bool = False):
+        self.key = key
+        self.as_integer = as_integer
+        self.type = db.SmallInteger() if as_integer else db.String()
+        super().__init__(column)
+
+@compiles(json_field)
+def _compile_json_field(element, compiler, **kw):
+    value = f"({compiler.process(element.clauses, **kw)} ->> '{element.key}')"
+    return f"({value}::numeric::smallint)" if element.as_integer else value
+
+@compiles(json_field, "sqlite")
+def _compile_json_field_sqlite(element, compiler, **kw):
+    value = f"json_extract({compiler.process(element.clauses, **kw)}, '$.{element.key}')"
+    return f"CAST({value} AS INTEGER)" if element.as_integer else value
+
+def _start_of_hour(value: datetime) -> datetime:
+    """Python counterpart of hour_bucket for bound parameters"""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+# Hourly feedback sums kept current by a trigger, see
+# db/migrations/006_prediction_feedback_running_sums.sql
+FEEDBACK_RUNNING_TABLE = "prediction_feedback_running"
+
+def _pearson_from_sums(n: int, sum_a: float, sum_c: float, sum_ac: float,
+                       sum_a2: float, sum_c2: float) -> float:
+    """Pearson correlation from running sums, 0.0 when either side has no variance"""
+    denominator = math.sqrt(max(n * sum_a2 - sum_a ** 2, 0.0) * max(n * sum_c2 - sum_c ** 2, 0.0))
+    if n < 2 or denominator == 0:
+        return 0.0
+    return (n * sum_ac - sum_a * sum_c) / denominator
+
+def _settable_fields(model, *excluded: str) -> frozenset:
+    """Column attributes create_or_update may assign: no primary key, generated or excluded columns"""
+    return frozenset(
+        column.key for column in model.__table__.columns
+        if not column.primary_key and column.computed is None and column.key not in excluded
+    )
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -22,16 +102,41 @@ class User(UserMixin, db.Model):
     def __repr__(self):
         return f'<User {self.username}>'
 
+# Value columns written by PriceHistory.add_price_data_bulk
+PRICE_UPSERT_COLUMNS = (
+    "hourly_price", "hourly_average", "day_ahead_price",
+    "predicted_price", "prediction_confidence"
+)
+
 class PriceHistory(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     provider = db.Column(db.String(50), nullable=False)  # e.g., 'ComEd'
-    hourly_price = db.Column(db.Float, nullable=False)
-    hourly_average = db.Column(db.Float, nullable=True)  # Current hour average
-    day_ahead_price = db.Column(db.Float, nullable=True)
-    predicted_price = db.Column(db.Float, nullable=True)
-    prediction_accuracy = db.Column(db.Float, nullable=True)  # Store accuracy feedback
-    prediction_confidence = db.Column(db.Float, nullable=True)
+    # Prices carry three decimals at most, so single precision (real) is plenty
+    hourly_price = db.Column(db.Float(precision=24), nullable=False)
+    hourly_average = db.Column(db.Float(precision=24), nullable=True)  # Current hour average
+    day_ahead_price = db.Column(db.Float(precision=24), nullable=True)
+    predicted_price = db.Column(db.Float(precision=24), nullable=True)
+    prediction_accuracy = db.Column(db.Float(precision=24), nullable=True)  # Store accuracy feedback
+    prediction_confidence = db.Column(db.Float(precision=24), nullable=True)
+    # Hour bucket maintained by the database, lets range scans prune by hour first
+    ts_hour = db.Column(db.DateTime, db.Computed(hour_bucket(timestamp), persisted=True))
+
+    # Recent-history lookups filter on provider/accuracy and order by timestamp.
+    # Feedback is rare, so rated rows get a small partial index of their own, which
+    # also carries accuracy and confidence so feedback reads skip the heap on PostgreSQL.
+    __table_args__ = (
+        db.Index('ix_price_history_timestamp', 'timestamp'),
+        # One row per provider tick; also serves the (provider, timestamp) range scans
+        db.UniqueConstraint('provider', 'timestamp', name='uq_price_history_provider_ts'),
+        db.Index('ix_price_history_provider_hour_ts', 'provider', 'ts_hour', 'timestamp'),
+        db.Index(
+            'ix_price_history_provider_ts_feedback_covering', 'provider', timestamp.desc(),
+            postgresql_include=['prediction_accuracy', 'prediction_confidence'],
+            postgresql_where=text('prediction_accuracy IS NOT NULL'),
+            sqlite_where=text('prediction_accuracy IS NOT NULL')
+        ),
+    )
 
     def __repr__(self):
         return f'<PriceHistory {self.timestamp}: provider={self.provider}, hourly={self.hourly_price}>'
@@ -40,8 +145,8 @@ class PriceHistory(db.Model):
     def add_price_data(hourly_price: float, hourly_average: Optional[float] = None, 
                       day_ahead_price: Optional[float] = None, predicted_price: Optional[float] = None, 
                       prediction_confidence: Optional[float] = None, timestamp: Optional[datetime] = None, 
-                      provider: str = "ComEd") -> "PriceHistory":
-        """Add new price data to the database"""
+                      provider: str = "ComEd", commit: bool = True) -> "PriceHistory":
+        """Add new price data to the database, leaving the commit to the caller if commit is False"""
         price_record = PriceHistory(
             provider=provider,
             timestamp=timestamp or datetime.utcnow(),
@@ -52,74 +157,186 @@ class PriceHistory(db.Model):
             prediction_confidence=prediction_confidence
         )
         db.session.add(price_record)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return price_record
 
+    @staticmethod
+    def add_price_data_bulk(records: List[dict]) -> int:
+        """Upsert many price records (add_price_data keyword dicts) keyed on provider and timestamp, with one commit"""
+        if not records:
+            return 0
+        table = PriceHistory.__table__
+        # executemany needs the same keys in every row; missing values stay None
+        rows = [
+            {column: record.get(column) for column in PRICE_UPSERT_COLUMNS} | {
+                "provider": record.get("provider", "ComEd"),
+                "timestamp": record.get("timestamp") or datetime.utcnow()
+            }
+            for record in records
+        ]
+        dialect = postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+        stmt = dialect.insert(table)
+        # A replayed tick refreshes the values it carries and keeps the ones it lacks
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.provider, table.c.timestamp],
+            set_={
+                column: func.coalesce(stmt.excluded[column], table.c[column])
+                for column in PRICE_UPSERT_COLUMNS
+            }
+        )
+        db.session.execute(stmt, rows)
+        db.session.commit()
+        return len(records)
+
     @staticmethod
     def update_prediction_accuracy(record_id: int, accuracy: float) -> bool:
         """Update the prediction accuracy based on feedback"""
-        record = PriceHistory.query.get(record_id)
-        if record:
-            record.prediction_accuracy = accuracy
-            db.session.commit()
-            return True
-        return False
+        # Single UPDATE statement; no need to load the row first
+        updated = PriceHistory.query.filter_by(id=record_id).update(
+            {PriceHistory.prediction_accuracy: accuracy},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return updated > 0
+
+    # The recent-history readers below run per request, so they are built with
+    # lambda_stmt: SQLAlchemy caches the constructed statement by the lambda's code
+    # and only re-binds provider and the window bounds on each call.
 
     @staticmethod
     def get_recent_history(provider: str, hours: int = 24) -> List["PriceHistory"]:
         """Get price history for the last specified hours for a specific provider"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-        return PriceHistory.query.filter(
+        cutoff_time, now = _recent_window(timedelta(hours=hours))
+        cutoff_hour = _start_of_hour(cutoff_time)
+        stmt = lambda_stmt(lambda: select(PriceHistory).where(
             PriceHistory.provider == provider,
-            PriceHistory.timestamp >= cutoff_time
-        ).order_by(PriceHistory.timestamp.desc()).all()
+            PriceHistory.ts_hour >= cutoff_hour,
+            PriceHistory.timestamp >= cutoff_time,
+            PriceHistory.timestamp < now
+        ).order_by(PriceHistory.timestamp.desc()))
+        return list(db.session.execute(stmt).scalars())
+
+    @staticmethod
+    def get_recent_prices(provider: str, hours: int = 24) -> List[float]:
+        """Get hourly prices (newest first) for the last specified hours without loading full rows"""
+        cutoff_time, now = _recent_window(timedelta(hours=hours))
+        cutoff_hour = _start_of_hour(cutoff_time)
+        stmt = lambda_stmt(lambda: select(PriceHistory.hourly_price).where(
+            PriceHistory.provider == provider,
+            PriceHistory.ts_hour >= cutoff_hour,
+            PriceHistory.timestamp >= cutoff_time,
+            PriceHistory.timestamp < now
+        ).order_by(PriceHistory.timestamp.desc()))
+        return list(db.session.execute(stmt).scalars())
 
     @staticmethod
     def get_recent_predictions_with_accuracy(provider: str) -> List["PriceHistory"]:
         """Get recent predictions that have accuracy feedback for a specific provider"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=72)  # Last 3 days
-        return PriceHistory.query.filter(
+        cutoff_time, now = _recent_window(timedelta(hours=72))  # Last 3 days
+        # Feedback consumers only read accuracy and confidence
+        stmt = lambda_stmt(lambda: select(PriceHistory).options(load_only(
+            PriceHistory.timestamp,
+            PriceHistory.prediction_accuracy,
+            PriceHistory.prediction_confidence
+        )).where(
             PriceHistory.provider == provider,
             PriceHistory.timestamp >= cutoff_time,
+            PriceHistory.timestamp < now,
             PriceHistory.prediction_accuracy.isnot(None)
-        ).order_by(PriceHistory.timestamp.desc()).all()
+        ).order_by(PriceHistory.timestamp.desc()))
+        return list(db.session.execute(stmt).scalars())
 
     """Add feedback tracking to prediction model"""
     @staticmethod
     def get_prediction_feedback_stats(provider: str, days: int = 30) -> dict:
         """Get statistics about prediction accuracy based on user feedback"""
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
-        records = PriceHistory.query.filter(
-            PriceHistory.provider == provider,
-            PriceHistory.timestamp >= cutoff_time,
-            PriceHistory.prediction_accuracy.isnot(None)
-        ).order_by(PriceHistory.timestamp.desc()).all()
+        cutoff_time, now = _recent_window(timedelta(days=days))
 
-        if not records:
-            return {
-                'accuracy': 0.0,
-                'total_predictions': 0,
-                'feedback_count': 0,
-                'confidence_correlation': 0.0
-            }
+        # On PostgreSQL read the running hourly sums instead of every row
+        if db.engine.dialect.name == "postgresql":
+            sums = PriceHistory._feedback_sums_with_running(provider, cutoff_time, now)
+            if sums is not None:
+                return PriceHistory._feedback_stats_from_sums(sums)
 
-        accuracies = [float(r.prediction_accuracy or 0.0) for r in records]
-        confidences = [float(r.prediction_confidence or 0.0) for r in records]
+        return PriceHistory._feedback_stats_from_sums(PriceHistory._feedback_sums(provider, cutoff_time, now))
 
-        stats = {
-            'accuracy': float(sum(accuracies) / len(accuracies)) if accuracies else 0.0,
-            'total_predictions': len(records),
-            'feedback_count': len([a for a in accuracies if a is not None]),
-        }
+    @staticmethod
+    def _feedback_sums(provider: str, start: datetime, end: datetime):
+        """Feedback sums over the rated rows in [start, end)"""
+        # Aggregate in the database: one row of sums instead of every rated prediction
+        accuracy = PriceHistory.prediction_accuracy
+        confidence = func.coalesce(PriceHistory.prediction_confidence, 0.0)
+        return db.session.query(
+            func.count().label('n'),
+            func.coalesce(func.sum(accuracy), 0.0).label('sum_a'),
+            func.coalesce(func.sum(confidence), 0.0).label('sum_c'),
+            func.coalesce(func.sum(accuracy * confidence), 0.0).label('sum_ac'),
+            func.coalesce(func.sum(accuracy * accuracy), 0.0).label('sum_a2'),
+            func.coalesce(func.sum(confidence * confidence), 0.0).label('sum_c2')
+        ).filter(
+            PriceHistory.provider == provider,
+            PriceHistory.timestamp >= start,
+            PriceHistory.timestamp < end,
+            accuracy.isnot(None)
+        ).one()
 
-        # Calculate correlation between confidence and accuracy
-        if len(confidences) > 1 and any(confidences):
-            confidence_correlation = np.corrcoef(accuracies, confidences)[0, 1]
-            stats['confidence_correlation'] = float(confidence_correlation)
-        else:
-            stats['confidence_correlation'] = 0.0
+    @staticmethod
+    def _feedback_sums_with_running(provider: str, start: datetime, end: datetime):
+        """Feedback sums over [start, end) matching _feedback_sums, None if the running sums table is unavailable"""
+        # Whole hours come from the running sums; the partial hours at either end of the
+        # window from the rows themselves, so both paths count exactly the same predictions
+        first_hour = _start_of_hour(start)
+        if first_hour < start:
+            first_hour += timedelta(hours=1)
+        last_hour = _start_of_hour(end)
+        if first_hour >= last_hour:
+            return PriceHistory._feedback_sums(provider, start, end)
+
+        hours = PriceHistory._feedback_sums_from_running_sums(provider, first_hour, last_hour)
+        if hours is None:
+            return None
+        parts = (
+            hours,
+            PriceHistory._feedback_sums(provider, start, first_hour),
+            PriceHistory._feedback_sums(provider, last_hour, end)
+        )
+        return SimpleNamespace(
+            n=sum(int(part.n) for part in parts),
+            **{field: sum(float(getattr(part, field)) for part in parts)
+               for field in ('sum_a', 'sum_c', 'sum_ac', 'sum_a2', 'sum_c2')}
+        )
+
+    @staticmethod
+    def _feedback_stats_from_sums(row) -> dict:
+        """Build feedback stats from a row of n, sum_a, sum_c, sum_ac, sum_a2 and sum_c2"""
+        n = int(row.n)
+        return {
+            'accuracy': float(row.sum_a) / n if n else 0.0,
+            'total_predictions': n,
+            'feedback_count': n,
+            'confidence_correlation': _pearson_from_sums(
+                n, float(row.sum_a), float(row.sum_c), float(row.sum_ac),
+                float(row.sum_a2), float(row.sum_c2)
+            )
+        }
 
-        return stats
+    @staticmethod
+    def _feedback_sums_from_running_sums(provider: str, first_hour: datetime, end_hour: datetime):
+        """Feedback sums for the hour buckets in [first_hour, end_hour), None if the running sums table is unavailable"""
+        try:
+            # Probe inside a savepoint so a missing table doesn't roll back the caller's pending work
+            with db.session.begin_nested():
+                return db.session.execute(text(
+                    "SELECT COALESCE(SUM(n), 0) AS n, COALESCE(SUM(sum_acc), 0) AS sum_a, "
+                    "COALESCE(SUM(sum_conf), 0) AS sum_c, COALESCE(SUM(sum_ac), 0) AS sum_ac, "
+                    "COALESCE(SUM(sum_a2), 0) AS sum_a2, COALESCE(SUM(sum_c2), 0) AS sum_c2 "
+                    f"FROM {FEEDBACK_RUNNING_TABLE} "
+                    "WHERE provider = :provider AND bucket >= :first_hour AND bucket < :end_hour"
+                ), {"provider": provider, "first_hour": first_hour, "end_hour": end_hour}).one()
+        except SQLAlchemyError as e:
+            logger.warning(f"Feedback running sums unavailable, aggregating rows instead: {str(e)}")
+            return None
 
 
 class UserPreferences(db.Model):
@@ -133,6 +350,12 @@ class UserPreferences(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Relationships: the one-to-one Tesla row is joined into the same query;
+    # collections stay lazy (use selectinload() when scanning many users)
+    tesla_preferences = db.relationship('TeslaPreferences', back_populates='user', uselist=False, lazy='joined')
+    analytics = db.relationship('UserAnalytics', back_populates='user', lazy='select')
+    savings_insights = db.relationship('SavingsInsight', back_populates='user', lazy='select')
+
     def __repr__(self):
         return f'<UserPreferences chat_id={self.chat_id}, threshold={self.price_threshold}>'
 
@@ -151,16 +374,20 @@ class UserPreferences(db.Model):
 
         # Update fields if provided
         for key, value in kwargs.items():
-            if hasattr(prefs, key):
+            if key in _USER_PREFERENCE_FIELDS:
                 setattr(prefs, key, value)
 
         db.session.commit()
         return prefs
 
+# Fields accepted by create_or_update, resolved once instead of hasattr per kwarg
+_USER_PREFERENCE_FIELDS = _settable_fields(UserPreferences, 'chat_id', 'created_at')
+
 class UserAnalytics(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     chat_id = db.Column(db.String(100), db.ForeignKey('user_preferences.chat_id'), nullable=False)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # Last update
+    analytics_date = db.Column(db.Date, nullable=False, default=lambda: datetime.utcnow().date())
     avg_daily_price = db.Column(db.Float, nullable=True)
     peak_usage_time = db.Column(db.Time, nullable=True)
     low_price_periods = db.Column(db.JSON, nullable=True)  # Store periods of consistently low prices
@@ -168,27 +395,33 @@ class UserAnalytics(db.Model):
     monthly_price_trend = db.Column(db.String(20), nullable=True)  # rising, falling, stable
 
     # Relationship
-    user = db.relationship('UserPreferences', backref=db.backref('analytics', lazy=True))
+    user = db.relationship('UserPreferences', back_populates='analytics')
+
+    # One analytics row per chat and (UTC) day
+    __table_args__ = (
+        db.UniqueConstraint('chat_id', 'analytics_date', name='uq_user_analytics_chat_date'),
+    )
 
     @staticmethod
     def create_or_update_analytics(chat_id: str, **kwargs) -> "UserAnalytics":
-        """Create or update user analytics"""
-        analytics = UserAnalytics.query.filter_by(
-            chat_id=str(chat_id),
-            timestamp=datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        ).first()
+        """Create or update today's user analytics"""
+        now = datetime.utcnow()
+        analytics = UserAnalytics.query.filter_by(chat_id=str(chat_id), analytics_date=now.date()).first()
 
         if not analytics:
-            analytics = UserAnalytics(chat_id=str(chat_id))
+            analytics = UserAnalytics(chat_id=str(chat_id), analytics_date=now.date())
             db.session.add(analytics)
+        analytics.timestamp = now
 
         for key, value in kwargs.items():
-            if hasattr(analytics, key):
+            if key in _USER_ANALYTICS_FIELDS:
                 setattr(analytics, key, value)
 
         db.session.commit()
         return analytics
 
+_USER_ANALYTICS_FIELDS = _settable_fields(UserAnalytics, 'chat_id', 'analytics_date')
+
 class SavingsInsight(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     chat_id = db.Column(db.String(100), db.ForeignKey('user_preferences.chat_id'), nullable=False)
@@ -200,7 +433,12 @@ class SavingsInsight(db.Model):
     implemented = db.Column(db.Boolean, default=False)  # Track if user implemented this saving
 
     # Relationship
-    user = db.relationship('UserPreferences', backref=db.backref('savings_insights', lazy=True))
+    user = db.relationship('UserPreferences', back_populates='savings_insights')
+
+    # Recent insights are listed per chat, newest first
+    __table_args__ = (
+        db.Index('ix_savings_insight_chat_ts', chat_id, timestamp.desc()),
+    )
 
     @staticmethod
     def add_insight(chat_id: str, potential_savings: float, recommendation_type: str, 
@@ -220,34 +458,45 @@ class SavingsInsight(db.Model):
     @staticmethod
     def get_user_insights(chat_id: str, days: int = 30) -> List["SavingsInsight"]:
         """Get recent insights for a user"""
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
+        cutoff_time, now = _recent_window(timedelta(days=days))
         return SavingsInsight.query.filter(
             SavingsInsight.chat_id == str(chat_id),
-            SavingsInsight.timestamp >= cutoff_time
+            SavingsInsight.timestamp >= cutoff_time,
+            SavingsInsight.timestamp < now
         ).order_by(SavingsInsight.timestamp.desc()).all()
 
 
 class TeslaPreferences(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    chat_id = db.Column(db.String(100), db.ForeignKey('user_preferences.chat_id'), nullable=False)
+    chat_id = db.Column(db.String(100), db.ForeignKey('user_preferences.chat_id'), nullable=False, index=True)
     enabled = db.Column(db.Boolean, default=False)
     vehicle_id = db.Column(db.String(100), nullable=True)
-    access_token = db.Column(db.String(500), nullable=True)
-    refresh_token = db.Column(db.String(500), nullable=True)
-    token_expiry = db.Column(db.DateTime, nullable=True)
     oauth_state = db.Column(db.String(100), nullable=True)  # Added for OAuth flow
     min_battery_level = db.Column(db.Integer, default=20)
     max_battery_level = db.Column(db.Integer, default=80)
     price_threshold = db.Column(db.Float, default=3.5)
     preferred_start_hour = db.Column(db.Integer, default=22)  # 10 PM
     preferred_end_hour = db.Column(db.Integer, default=6)    # 6 AM
-    last_vehicle_status = db.Column(db.JSON, nullable=True)  # Stores battery level, charging state, etc.
+    last_vehicle_status = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'), nullable=True)  # Stores battery level, charging state, etc.
+    # Typed copies of the hot status fields, generated by the database for SQL filtering/indexing
+    battery_level = db.Column(db.SmallInteger, db.Computed(json_field(last_vehicle_status, 'battery_level', as_integer=True), persisted=True))
+    charging_state = db.Column(db.String(32), db.Computed(json_field(last_vehicle_status, 'charging_state'), persisted=True))
     last_status_update = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship with UserPreferences
-    user = db.relationship('UserPreferences', backref=db.backref('tesla_preferences', uselist=False))
+    user = db.relationship('UserPreferences', back_populates='tesla_preferences')
+
+    # OAuth tokens live in a side table to keep these rows narrow; lazy='raise'
+    # stops the charging decision path from loading them by accident
+    tokens = db.relationship(
+        'TeslaTokens',
+        primaryjoin='TeslaPreferences.chat_id == foreign(TeslaTokens.chat_id)',
+        uselist=False,
+        viewonly=True,
+        lazy='raise'
+    )
 
     @staticmethod
     def get_preferences(chat_id: str) -> Optional["TeslaPreferences"]:
@@ -264,7 +513,7 @@ class TeslaPreferences(db.Model):
 
         # Update fields if provided
         for key, value in kwargs.items():
-            if hasattr(prefs, key):
+            if key in _TESLA_PREFERENCE_FIELDS:
                 setattr(prefs, key, value)
 
         db.session.commit()
@@ -278,55 +527,65 @@ class TeslaPreferences(db.Model):
 
     def update_auth_tokens(self, access_token: str, refresh_token: str) -> None:
         """Update authentication tokens"""
-        self.access_token = access_token
-        self.refresh_token = refresh_token
-        self.token_expiry = datetime.utcnow() + timedelta(hours=6)  # Tesla tokens typically expire in 8 hours
+        tokens = db.session.get(TeslaTokens, self.chat_id)
+        if not tokens:
+            tokens = TeslaTokens(chat_id=self.chat_id)
+            db.session.add(tokens)
+
+        tokens.access_token = access_token
+        tokens.refresh_token = refresh_token
+        tokens.token_expiry = datetime.utcnow() + timedelta(hours=6)  # Tesla tokens typically expire in 8 hours
         db.session.commit()
 
-    def is_preferred_charging_time(self) -> bool:
-        """Check if current time is within preferred charging hours"""
-        current_hour = datetime.now().hour
+    def is_preferred_charging_time(self, now: Optional[datetime] = None) -> bool:
+        """Check if the given (default: current) time is within preferred charging hours"""
+        current_hour = (now or datetime.now()).hour
+        start, end = self.preferred_start_hour, self.preferred_end_hour
 
-        # Handle overnight period (e.g., 22:00-06:00)
-        if self.preferred_start_hour > self.preferred_end_hour:
-            return current_hour >= self.preferred_start_hour or current_hour < self.preferred_end_hour
-        else:
-            return self.preferred_start_hour <= current_hour < self.preferred_end_hour
+        # Overnight windows (e.g., 22:00-06:00) wrap past midnight
+        if start > end:
+            return current_hour >= start or current_hour < end
+        return start <= current_hour < end
 
-    def should_start_charging(self, current_price: float) -> bool:
-        """Determine if charging should start based on price and battery level"""
+    def should_start_charging(self, current_price: float, now: Optional[datetime] = None) -> bool:
+        """Determine if charging should start; pass now to share one clock read across vehicles"""
         if not self.enabled or not self.last_vehicle_status:
             return False
 
-        battery_level = self.last_vehicle_status.get('battery_level', 0)
-        charging_state = self.last_vehicle_status.get('charging_state', 'Stopped')
-
-        # Emergency charging if battery is below minimum
-        emergency = battery_level <= self.min_battery_level
+        # Generated from the status blob; the commit in update_vehicle_status expires the row,
+        # so this comes back in the same reload SELECT as the other columns
+        battery_level = self.battery_level or 0
 
-        # If it's an emergency, charge regardless of time or price
-        if emergency:
+        # Emergency charging if battery is below minimum, regardless of time or price
+        if battery_level <= self.min_battery_level:
             return True
 
-        # Check if current time is within preferred charging hours
-        if not self.is_preferred_charging_time():
-            return False
-
-        # Check if price is below threshold
+        # Price and battery are cheap comparisons; only consult the clock if both pass
         price_ok = current_price <= self.price_threshold
-
-        # Check if battery is below max level
         battery_ok = battery_level < self.max_battery_level
 
-        return price_ok and battery_ok
+        return price_ok and battery_ok and self.is_preferred_charging_time(now)
 
     def should_stop_charging(self, current_price: float) -> bool:
         """Determine if charging should stop based on price and battery level"""
         if not self.enabled or not self.last_vehicle_status:
             return False
 
-        battery_level = self.last_vehicle_status.get('battery_level', 0)
-        charging_state = self.last_vehicle_status.get('charging_state', 'Stopped')
+        battery_level = self.battery_level or 0
 
         # Stop if price is above threshold or battery is full
-        return (current_price > self.price_threshold and battery_level > self.min_battery_level) or battery_level >= self.max_battery_level
\ No newline at end of file
+        return (current_price > self.price_threshold and battery_level > self.min_battery_level) or battery_level >= self.max_battery_level
+
+_TESLA_PREFERENCE_FIELDS = _settable_fields(TeslaPreferences, 'chat_id', 'created_at')
+
+class TeslaTokens(db.Model):
+    __tablename__ = 'tesla_tokens'
+
+    chat_id = db.Column(db.String(100), db.ForeignKey('user_preferences.chat_id'), primary_key=True)
+    access_token = db.Column(db.String(500), nullable=True)
+    refresh_token = db.Column(db.String(500), nullable=True)
+    token_expiry = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<TeslaTokens chat_id={self.chat_id}, expires={self.token_expiry}>'
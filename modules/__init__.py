@@ -1,27 +1,76 @@
+import importlib
+import logging
+import os
+import threading
+import time
+from functools import cache
+
 from .base_module import BaseModule
 from .module_manager import ModuleManager
 from .errors import ModuleError
-from .price_monitor_module import PriceMonitorModule
-from .pattern_analysis_module import PatternAnalysisModule
-from .ml_prediction_module import MLPredictionModule
 
-# Lazy imports to avoid circular dependencies
+logger = logging.getLogger(__name__)
+
+# Feature modules pull in heavy dependencies, so they are imported on first access
+_LAZY_MODULES = {
+    'PriceMonitorModule': '.price_monitor_module',
+    'PatternAnalysisModule': '.pattern_analysis_module',
+    'MLPredictionModule': '.ml_prediction_module',
+    'DashboardModule': '.dashboard_module',
+}
+
+def __getattr__(name):
+    """Import feature module classes on first access (PEP 562)"""
+    module_path = _LAZY_MODULES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+# Lazy imports to avoid circular dependencies; cached so repeat calls skip the import machinery
+@cache
 def get_price_monitor_module():
     from .price_monitor_module import PriceMonitorModule
     return PriceMonitorModule
 
+@cache
 def get_pattern_analysis_module():
     from .pattern_analysis_module import PatternAnalysisModule
     return PatternAnalysisModule
 
+@cache
 def get_ml_prediction_module():
-    from .ml_prediction_module import MLPredictionModule 
+    from .ml_prediction_module import MLPredictionModule
     return MLPredictionModule
 
+@cache
 def get_dashboard_module():
     from .dashboard_module import DashboardModule
     return DashboardModule
 
+WARM_DELAY = 0.5  # Seconds to let startup settle before warming feature modules
+
+@cache
+def warm_modules() -> None:
+    """Import the feature modules in a background thread, once per process (skipped if MODULES_NO_WARM is set)"""
+    if os.environ.get("MODULES_NO_WARM"):
+        return
+
+    def warm():
+        time.sleep(WARM_DELAY)
+        for get_module in (get_price_monitor_module, get_pattern_analysis_module,
+                           get_ml_prediction_module, get_dashboard_module):
+            try:
+                get_module()
+            except Exception as e:
+                logger.warning(f"Failed to pre-import module: {str(e)}")
+
+    threading.Thread(target=warm, name="modules-warmup", daemon=True).start()
+
 __all__ = [
     'BaseModule',
     'ModuleManager',
@@ -30,7 +79,9 @@ __all__ = [
     'get_price_monitor_module',
     'get_pattern_analysis_module',
     'get_ml_prediction_module',
+    'warm_modules',
     'PriceMonitorModule',
     'PatternAnalysisModule',
-    'MLPredictionModule'
-]
\ No newline at end of file
+    'MLPredictionModule',
+    'DashboardModule'
+]
@@ -1,15 +1,36 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
+from functools import cache
 import os
-from telegram import Bot
+
+if TYPE_CHECKING:
+    # Only needed for annotations; modules only hold a bot handed to them by the caller
+    from telegram import Bot
 
 logger = logging.getLogger(__name__)
 
+ADMIN_BATCH_SIZE = 10  # Most alerts folded into one admin message
+ADMIN_BATCH_WINDOW = 2.0  # Seconds to wait for further alerts before sending
+
+@cache
+def admin_chat_id() -> Optional[str]:
+    """ADMIN_CHAT_ID, read once on first use (after config has loaded any .env file)"""
+    return os.environ.get("ADMIN_CHAT_ID")
+
 class BaseModule(ABC):
     """Base class for all pluggable modules with independent error handling"""
 
+    # Fixed attribute layout; subclasses declare their own __slots__ for extra state
+    __slots__ = (
+        "name", "description", "enabled", "config", "last_error", "last_error_time",
+        "_last_error_time_iso", "consecutive_failures", "status", "admin_chat_id",
+        "_bot", "_status_cache", "_disabled_response", "_error_message",
+        "_admin_queue", "_admin_sender", "_admin_prefix"
+    )
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -17,10 +38,23 @@ class BaseModule(ABC):
         self.config: Dict[str, Any] = {}
         self.last_error: Optional[str] = None
         self.last_error_time: Optional[datetime] = None
+        self._last_error_time_iso: Optional[str] = None  # Formatted once per error
         self.consecutive_failures = 0
         self.status = "initialized"
-        self.admin_chat_id = os.environ.get("ADMIN_CHAT_ID")
-        self._bot: Optional[Bot] = None
+        self.admin_chat_id = admin_chat_id()
+        self._bot: Optional["Bot"] = None
+        # Pending admin alerts and the task sending them in batches
+        self._admin_queue: Optional[asyncio.Queue] = None
+        self._admin_sender: Optional[asyncio.Task] = None
+        # (state, status dict) from the last get_status call
+        self._status_cache: Optional[Tuple[tuple, Dict[str, Any]]] = None
+        # safe_process envelopes depend only on the name, so build them once
+        self._disabled_response = {
+            "status": "disabled",
+            "message": f"Module {name} is disabled"
+        }
+        self._error_message = f"Module {name} encountered an error but system continues"
+        self._admin_prefix = f"🤖 Module Alert ({name}):\n"
 
     @abstractmethod
     async def initialize(self) -> bool:
@@ -37,17 +71,40 @@ class BaseModule(ABC):
         """Get data to be included in notifications when this module is enabled"""
         pass
 
-    def set_bot(self, bot: Bot):
+    def set_bot(self, bot: "Bot"):
         """Set the bot instance for admin notifications"""
         self._bot = bot
 
     async def notify_admin(self, message: str):
-        """Send notification to admin if admin chat ID is set"""
-        if self.admin_chat_id and self._bot:
+        """Queue a notification to admin if admin chat ID is set; alerts are sent in batches"""
+        if not (self.admin_chat_id and self._bot):
+            return
+        # The sender exits once the queue stays idle, so start a fresh one on demand
+        if self._admin_sender is None or self._admin_sender.done():
+            self._admin_queue = asyncio.Queue()
+            self._admin_sender = asyncio.create_task(self._send_admin_batches(self._admin_queue))
+        self._admin_queue.put_nowait(message)
+
+    async def _send_admin_batches(self, queue: asyncio.Queue):
+        """Send queued admin alerts, folding up to ADMIN_BATCH_SIZE into one message"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                batch = [await asyncio.wait_for(queue.get(), ADMIN_BATCH_WINDOW)]
+            except asyncio.TimeoutError:
+                return
+
+            deadline = loop.time() + ADMIN_BATCH_WINDOW
+            while len(batch) < ADMIN_BATCH_SIZE:
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), max(deadline - loop.time(), 0)))
+                except asyncio.TimeoutError:
+                    break
+
             try:
                 await self._bot.send_message(
                     chat_id=self.admin_chat_id,
-                    text=f"🤖 Module Alert ({self.name}):\n{message}"
+                    text=self._admin_prefix + "\n\n".join(batch)
                 )
             except Exception as e:
                 logger.error(f"Failed to send admin notification: {str(e)}")
@@ -56,13 +113,13 @@ class BaseModule(ABC):
         """Enable this module"""
         self.enabled = True
         self.status = "enabled"
-        logger.info(f"Module {self.name} enabled")
+        logger.info("Module %s enabled", self.name)
 
     def disable(self):
         """Disable this module"""
         self.enabled = False
         self.status = "disabled"
-        logger.info(f"Module {self.name} disabled")
+        logger.info("Module %s disabled", self.name)
 
     def is_enabled(self) -> bool:
         """Check if module is enabled"""
@@ -70,13 +127,17 @@ class BaseModule(ABC):
 
     def update_config(self, config: Dict[str, Any]):
         """Update module configuration"""
+        # Configs are often re-pushed unchanged; skip those without logging
+        if all(key in self.config and self.config[key] == value for key, value in config.items()):
+            return
         self.config.update(config)
-        logger.info(f"Updated config for module {self.name}")
+        logger.info("Updated config for module %s", self.name)
 
     async def record_error(self, error: str):
         """Record an error occurrence and notify admin"""
         self.last_error = error
         self.last_error_time = datetime.utcnow()
+        self._last_error_time_iso = self.last_error_time.isoformat()
         self.consecutive_failures += 1
         self.status = "error"
 
@@ -84,7 +145,7 @@ class BaseModule(ABC):
             f"Module {self.name} error:\n"
             f"Error: {error}\n"
             f"Consecutive failures: {self.consecutive_failures}\n"
-            f"Time: {self.last_error_time.isoformat()}"
+            f"Time: {self._last_error_time_iso}"
         )
         logger.error(error_msg)
         await self.notify_admin(error_msg)
@@ -94,31 +155,33 @@ class BaseModule(ABC):
         if self.consecutive_failures > 0:
             self.last_error = None
             self.last_error_time = None
+            self._last_error_time_iso = None
             self.consecutive_failures = 0
             self.status = "enabled" if self.enabled else "disabled"
-            logger.info(f"Module {self.name} errors cleared")
+            logger.info("Module %s errors cleared", self.name)
 
     def get_status(self) -> Dict[str, Any]:
-        """Get detailed module status"""
-        return {
-            "name": self.name,
-            "description": self.description,
-            "enabled": self.enabled,
-            "status": self.status,
-            "last_error": self.last_error,
-            "last_error_time": self.last_error_time.isoformat() if self.last_error_time else None,
-            "consecutive_failures": self.consecutive_failures,
-            "is_critical": self.name == "price_monitor"
-        }
+        """Get detailed module status (shared while the state is unchanged, so do not mutate it)"""
+        # Keyed on the state itself, so subclasses that set attributes directly stay correct
+        state = (self.enabled, self.status, self.last_error, self.last_error_time, self.consecutive_failures)
+        if self._status_cache is None or self._status_cache[0] != state:
+            self._status_cache = (state, {
+                "name": self.name,
+                "description": self.description,
+                "enabled": self.enabled,
+                "status": self.status,
+                "last_error": self.last_error,
+                "last_error_time": self._last_error_time_iso,
+                "consecutive_failures": self.consecutive_failures,
+                "is_critical": self.name == "price_monitor"
+            })
+        return self._status_cache[1]
 
     async def safe_process(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Safely process data with error handling and recovery"""
+        """Safely process data with error handling and recovery (the disabled response is shared, do not mutate it)"""
         try:
             if not self.enabled:
-                return {
-                    "status": "disabled",
-                    "message": f"Module {self.name} is disabled"
-                }
+                return self._disabled_response
 
             result = await self.process(data)
             self.clear_errors()
@@ -132,7 +195,7 @@ class BaseModule(ABC):
             if self.name != "price_monitor":
                 return {
                     "status": "error",
-                    "message": f"Module {self.name} encountered an error but system continues",
+                    "message": self._error_message,
                     "error": error_msg
                 }
             else:
@@ -1,29 +1,51 @@
 import logging
+import time
+from bisect import bisect_right
+from collections import deque
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from flask import current_app
 from .base_module import BaseModule
-from database import get_db
 from models import PriceHistory
 
 logger = logging.getLogger(__name__)
 
+LATEST_PRICE_TTL = 30  # Seconds a loaded latest price is reused before hitting the database again
+
 class DashboardModule(BaseModule):
     """Module for managing analytics dashboard and data visualization"""
 
+    # Counters are plain slots; the metrics dict is only assembled when read
+    __slots__ = (
+        "active_users", "total_predictions", "accuracy_rate", "price_alerts_sent",
+        "price_trends", "_trend_times", "latest_price_data", "_latest_loaded_at"
+    )
+
     def __init__(self):
         super().__init__(
             name="dashboard",
             description="Provides analytics dashboard and data visualization capabilities"
         )
-        self.metrics = {
-            'active_users': 0,
-            'total_predictions': 0,
-            'accuracy_rate': 0.0,
-            'price_alerts_sent': 0,
-            'price_trends': []
-        }
+        self.active_users = 0
+        self.total_predictions = 0
+        self.accuracy_rate = 0.0
+        self.price_alerts_sent = 0
+        self.price_trends: deque = deque()
+        # Parsed timestamps matching price_trends, oldest first, so pruning never re-parses
+        self._trend_times: deque = deque()
         self.latest_price_data = None
+        self._latest_loaded_at: Optional[float] = None
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Current dashboard metrics"""
+        return {
+            'active_users': self.active_users,
+            'total_predictions': self.total_predictions,
+            'accuracy_rate': self.accuracy_rate,
+            'price_alerts_sent': self.price_alerts_sent,
+            'price_trends': list(self.price_trends)
+        }
 
     async def initialize(self) -> bool:
         """Initialize dashboard module"""
@@ -43,11 +65,14 @@ class DashboardModule(BaseModule):
 
     def _load_latest_price_data(self):
         """Load the latest price data from database"""
+        if (self.latest_price_data and self._latest_loaded_at is not None
+                and time.monotonic() - self._latest_loaded_at < LATEST_PRICE_TTL):
+            return
         try:
-            db = get_db()
-            latest_record = PriceHistory.query.order_by(
-                PriceHistory.timestamp.desc()
-            ).first()
+            # Newest row via the timestamp index, fetching only the two columns used
+            latest_record = PriceHistory.query.with_entities(
+                PriceHistory.hourly_price, PriceHistory.timestamp
+            ).order_by(PriceHistory.timestamp.desc()).first()
 
             if latest_record:
                 self.latest_price_data = {
@@ -55,7 +80,8 @@ class DashboardModule(BaseModule):
                     'timestamp': latest_record.timestamp,
                     'trend': 'stable'  # Default trend
                 }
-                logger.info(f"Loaded latest price data: {self.latest_price_data}")
+                self._latest_loaded_at = time.monotonic()
+                logger.info("Loaded latest price data: %s", self.latest_price_data)
             else:
                 logger.warning("No price history data found")
                 self.latest_price_data = {'price': 0, 'timestamp': datetime.now(), 'trend': 'unknown'}
@@ -68,30 +94,25 @@ class DashboardModule(BaseModule):
         try:
             if 'price_data' in data:
                 self.latest_price_data = data['price_data']
-                logger.info(f"Updated latest price data: {self.latest_price_data}")
+                logger.info("Updated latest price data: %s", self.latest_price_data)
 
             if 'user_activity' in data:
-                self.metrics['active_users'] += 1
+                self.active_users += 1
 
             if 'prediction_result' in data:
-                self.metrics['total_predictions'] += 1
+                self.total_predictions += 1
                 # Update accuracy based on actual vs predicted
                 predicted = data['prediction_result'].get('predicted_price', 0)
                 actual = data['prediction_result'].get('actual_price', 0)
                 if actual != 0:
                     accuracy = 1 - abs(predicted - actual) / actual
-                    self.metrics['accuracy_rate'] = (
-                        (self.metrics['accuracy_rate'] * (self.metrics['total_predictions'] - 1) + accuracy) 
-                        / self.metrics['total_predictions']
-                    )
+                    # Incremental mean update, same result without rescaling the running total
+                    self.accuracy_rate += (accuracy - self.accuracy_rate) / self.total_predictions
 
             if 'price_alert' in data:
-                self.metrics['price_alerts_sent'] += 1
+                self.price_alerts_sent += 1
                 if self.latest_price_data:
-                    self.metrics['price_trends'].append({
-                        'timestamp': self.latest_price_data['timestamp'].isoformat(),
-                        'price': self.latest_price_data['price']
-                    })
+                    self._add_price_trend(self.latest_price_data['timestamp'], self.latest_price_data['price'])
                     # Keep only last 24 hours of price trends
                     self._cleanup_price_trends()
 
@@ -119,10 +140,10 @@ class DashboardModule(BaseModule):
 
             return {
                 "current_price": self.latest_price_data['price'] if self.latest_price_data else None,
-                "active_users": self.metrics['active_users'],
-                "total_predictions": self.metrics['total_predictions'],
-                "accuracy_rate": round(self.metrics['accuracy_rate'] * 100, 2),
-                "alerts_sent": self.metrics['price_alerts_sent'],
+                "active_users": self.active_users,
+                "total_predictions": self.total_predictions,
+                "accuracy_rate": round(self.accuracy_rate * 100, 2),
+                "alerts_sent": self.price_alerts_sent,
                 "price_trend": self._get_price_trend_summary()
             }
         except Exception as e:
@@ -131,25 +152,37 @@ class DashboardModule(BaseModule):
 
     async def _reset_daily_metrics(self) -> None:
         """Reset daily metrics at midnight"""
-        self.metrics['active_users'] = 0
-        self.metrics['price_alerts_sent'] = 0
+        self.active_users = 0
+        self.price_alerts_sent = 0
+
+    def _add_price_trend(self, timestamp: datetime, price: float) -> None:
+        """Record a price trend point, keeping the trends sorted by timestamp"""
+        trend = {'timestamp': timestamp.isoformat(), 'price': price}
+        # Ticks usually arrive in order; a late one is slotted into place rather than appended
+        if not self._trend_times or timestamp >= self._trend_times[-1]:
+            self._trend_times.append(timestamp)
+            self.price_trends.append(trend)
+            return
+        index = bisect_right(self._trend_times, timestamp)
+        self._trend_times.insert(index, timestamp)
+        self.price_trends.insert(index, trend)
 
     def _cleanup_price_trends(self) -> None:
         """Remove price trends older than 24 hours"""
-        now = datetime.now()
-        self.metrics['price_trends'] = [
-            trend for trend in self.metrics['price_trends']
-            if (now - datetime.fromisoformat(trend['timestamp'])) < timedelta(hours=24)
-        ]
+        # Trends are kept sorted by timestamp, so expired ones are always at the front
+        cutoff = datetime.now() - timedelta(hours=24)
+        trends = self.price_trends
+        while self._trend_times and self._trend_times[0] <= cutoff:
+            self._trend_times.popleft()
+            trends.popleft()
 
     def _get_price_trend_summary(self) -> Dict[str, Any]:
         """Get summary of price trends for the last 24 hours"""
-        if not self.metrics['price_trends']:
-            return {"trend": "stable", "change": 0}
-
-        prices = [t['price'] for t in self.metrics['price_trends']]
-        if len(prices) >= 2:
-            change = ((prices[-1] - prices[0]) / prices[0]) * 100
+        trends = self.price_trends
+        # Only the oldest and newest prices matter, both O(1) to reach in the deque
+        if len(trends) >= 2:
+            first, last = trends[0]['price'], trends[-1]['price']
+            change = ((last - first) / first) * 100
             trend = "up" if change > 0 else "down" if change < 0 else "stable"
             return {
                 "trend": trend,
@@ -1,26 +1,53 @@
 from typing import Dict, Any, Optional
 import logging
+import time
+from collections import OrderedDict, deque
 import numpy as np
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
 from .base_module import BaseModule
+from .price_series import PriceSeries, TRENDS
 
 logger = logging.getLogger(__name__)
 
+FEATURE_WINDOW = 24  # Hours of prices behind each feature row
+FEATURE_COUNT = 8  # Columns produced by _window_features
+MODEL_REFIT_INTERVAL = 6  # Price ticks between model refits once trained
+MIN_FIT_INTERVAL = 300  # Seconds between refits, so bursts of ticks (e.g. a backfill) don't refit repeatedly
+PREDICTION_CACHE_SIZE = 256  # Feature fingerprints remembered per fitted model
+PREDICT_INTERVAL = 4  # Ticks between full model predictions; ticks in between extrapolate
+PREDICTION_HISTORY_SIZE = 7 * 24  # Predictions kept for notifications and confidence checks
+
 class MLPredictionModule(BaseModule):
     """Module for ML-based price predictions and warnings"""
 
+    __slots__ = (
+        "model", "_feature_mean", "_feature_scale", "price_history", "prediction_history", "is_model_trained",
+        "_ticks_since_fit", "_last_fit_time", "_feature_buf", "_prediction_cache", "_full_predictions", "_ticks_since_predict"
+    )
+
     def __init__(self):
         super().__init__(
             name="ml_prediction",
             description="Provides ML-based price predictions and warnings"
         )
         self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.scaler = StandardScaler()
-        self.price_history = []
-        self.prediction_history = []
+        # Feature standardisation from the last fit, applied by hand at predict time
+        self._feature_mean: Optional[np.ndarray] = None
+        self._feature_scale: Optional[np.ndarray] = None
+        self.price_history = PriceSeries()
+        # Only the latest predictions are read, so the history is capped
+        self.prediction_history = deque(maxlen=PREDICTION_HISTORY_SIZE)
         self.is_model_trained = False
+        self._ticks_since_fit = 0
+        self._last_fit_time = 0.0
+        # Training matrix reused across refits; float32 is what the forest trains on, so fit doesn't copy it
+        self._feature_buf = np.empty((7 * 24, FEATURE_COUNT), dtype=np.float32)
+        # Rounded feature row bytes -> model prediction, valid for the current fit only
+        self._prediction_cache: "OrderedDict[bytes, float]" = OrderedDict()
+        # Last two full model predictions, the basis for extrapolated ticks
+        self._full_predictions: deque = deque(maxlen=2)
+        self._ticks_since_predict = 0
 
     async def initialize(self) -> bool:
         """Initialize the ML prediction module"""
@@ -31,59 +58,107 @@ class MLPredictionModule(BaseModule):
             logger.error(f"Failed to initialize ML prediction module: {str(e)}")
             return False
 
-    def _prepare_features(self, prices: list) -> np.ndarray:
-        """Prepare feature matrix for prediction"""
-        if len(prices) < 24:
+    def _window_features(self, prices: list, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Feature rows for every 24-hour window of prices, oldest first (written into out if given)"""
+        arr = np.asarray(prices, dtype=np.float64)
+        if len(arr) < FEATURE_WINDOW:
             return np.array([])
 
-        features = []
-        for i in range(len(prices) - 24):
-            window = prices[i:i+24]
-            features.append([
-                np.mean(window),
-                np.std(window),
-                np.min(window),
-                np.max(window),
-                window[-1],  # Last price
-                window[-1] - window[0],  # Price change
-                np.mean(window[-6:]),  # Short-term average
-                np.mean(window)  # Long-term average
-            ])
-        return np.array(features)
+        # One strided view of all windows, reduced along axis 1 instead of per-window calls
+        windows = np.lib.stride_tricks.sliding_window_view(arr, FEATURE_WINDOW)
+        n_rows = len(windows)
+        X = np.empty((n_rows, FEATURE_COUNT)) if out is None else out[:n_rows]
+        windows.mean(axis=1, out=X[:, 0])
+        windows.std(axis=1, out=X[:, 1])
+        windows.min(axis=1, out=X[:, 2])
+        windows.max(axis=1, out=X[:, 3])
+        X[:, 4] = windows[:, -1]  # Last price
+        np.subtract(windows[:, -1], windows[:, 0], out=X[:, 5])  # Price change
+        windows[:, -6:].mean(axis=1, out=X[:, 6])  # Short-term average
+        # Long-term average: mean of all history up to the end of each window
+        np.divide(np.cumsum(arr)[FEATURE_WINDOW - 1:], np.arange(FEATURE_WINDOW, len(arr) + 1), out=X[:, 7])
+        return X
+
+    def _prepare_features(self, prices: list) -> np.ndarray:
+        """Prepare feature matrix for training (windows that have a next-hour target)"""
+        rows = len(prices) - FEATURE_WINDOW + 1
+        # Reuse one training buffer across refits, growing it as history grows
+        if rows > 0 and len(self._feature_buf) < rows:
+            self._feature_buf = np.empty((max(rows, 2 * len(self._feature_buf)), FEATURE_COUNT), dtype=np.float32)
+        return self._window_features(prices, out=self._feature_buf)[:-1]
 
     def _prepare_targets(self, prices: list) -> np.ndarray:
         """Prepare target values for training"""
-        if len(prices) < 25:
+        if len(prices) < FEATURE_WINDOW + 1:
             return np.array([])
-
-        targets = []
-        for i in range(len(prices) - 24):
-            targets.append(prices[i+24])  # Next hour's price
-        return np.array(targets)
+        return np.asarray(prices[FEATURE_WINDOW:], dtype=np.float64)  # Next hour's price
 
     def _update_model(self):
         """Update the model with recent price data"""
         if len(self.price_history) < 48:  # Need at least 48 hours of data
             return
 
+        # Refitting the forest dominates each tick; once trained, refit in batches
+        self._ticks_since_fit += 1
+        if self.is_model_trained and (
+            self._ticks_since_fit < MODEL_REFIT_INTERVAL
+            or time.monotonic() - self._last_fit_time < MIN_FIT_INTERVAL
+        ):
+            return
+
         try:
-            prices = [p['price'] for p in self.price_history]
+            prices = self.price_history.prices
             X = self._prepare_features(prices)
             y = self._prepare_targets(prices)
 
             if len(X) == 0 or len(y) == 0:
                 return
 
-            # Scale features
-            X_scaled = self.scaler.fit_transform(X)
+            # Scale features in place; constant features keep a unit scale
+            mean = X.mean(axis=0)
+            scale = X.std(axis=0)
+            scale[scale == 0.0] = 1.0
+            X -= mean
+            X /= scale
 
             # Train model
-            self.model.fit(X_scaled, y)
+            self.model.fit(X, y)
+            self._feature_mean, self._feature_scale = mean, scale
             self.is_model_trained = True
+            self._ticks_since_fit = 0
+            self._last_fit_time = time.monotonic()
+            self._prediction_cache.clear()
+            self._full_predictions.clear()  # Don't extrapolate across two different models
 
         except Exception as e:
             logger.error(f"Error updating model: {str(e)}")
 
+    def _predict_cached(self, X: np.ndarray) -> float:
+        """Scale and predict one feature row, reusing the result for an unchanged window"""
+        key = np.round(X[-1], 2).tobytes()
+        prediction = self._prediction_cache.get(key)
+        if prediction is not None:
+            self._prediction_cache.move_to_end(key)
+            return prediction
+
+        prediction = float(self.model.predict((X - self._feature_mean) / self._feature_scale)[-1])
+        self._prediction_cache[key] = prediction
+        if len(self._prediction_cache) > PREDICTION_CACHE_SIZE:
+            self._prediction_cache.popitem(last=False)
+        return prediction
+
+    def _next_prediction(self, X: np.ndarray) -> float:
+        """Full model prediction every PREDICT_INTERVAL ticks, linear extrapolation in between"""
+        self._ticks_since_predict += 1
+        if len(self._full_predictions) == 2 and self._ticks_since_predict < PREDICT_INTERVAL:
+            previous, latest = self._full_predictions
+            return latest + (self._ticks_since_predict / PREDICT_INTERVAL) * (latest - previous)
+
+        prediction = self._predict_cached(X)
+        self._full_predictions.append(prediction)
+        self._ticks_since_predict = 0
+        return prediction
+
     def _calculate_prediction_confidence(self, prediction: float, actual: float) -> float:
         """Calculate confidence score based on prediction accuracy"""
         if actual == 0:
@@ -99,18 +174,9 @@ class MLPredictionModule(BaseModule):
             current_price = data.get('current_price', 0)
             timestamp = data.get('timestamp', datetime.now())
 
-            # Add to price history
-            self.price_history.append({
-                'price': current_price,
-                'timestamp': timestamp
-            })
-
-            # Clean old data (keep last 7 days)
-            cutoff = datetime.now() - timedelta(days=7)
-            self.price_history = [
-                point for point in self.price_history 
-                if point['timestamp'] > cutoff
-            ]
+            # Add to price history and clean old data (keep last 7 days)
+            self.price_history.append(current_price, timestamp)
+            self.price_history.prune(datetime.now() - timedelta(days=7))
 
             # Update model if needed
             self._update_model()
@@ -141,9 +207,8 @@ class MLPredictionModule(BaseModule):
                     "predictions": prediction_data
                 }
 
-            # Prepare current data for prediction
-            prices = [p['price'] for p in self.price_history[-24:]]
-            X = self._prepare_features([prices[-24:]])
+            # Features of the latest window, built the same way as the training rows
+            X = self._window_features(self.price_history.prices)[-1:]
 
             if len(X) == 0:
                 prediction_data = {
@@ -170,9 +235,7 @@ class MLPredictionModule(BaseModule):
                     "predictions": prediction_data
                 }
 
-            # Scale and predict
-            X_scaled = self.scaler.transform(X)
-            prediction = self.model.predict(X_scaled)[-1]
+            prediction = self._next_prediction(X)
 
             # Calculate confidence
             confidence = 70.0  # Base confidence
@@ -185,22 +248,21 @@ class MLPredictionModule(BaseModule):
                     )
                     confidence = accuracy
 
-            # Determine trend
-            trend = "stable"
-            if prediction > current_price * 1.05:
-                trend = "rising"
-            elif prediction < current_price * 0.95:
-                trend = "falling"
+            # Determine trend: +1 above the 5% band, -1 below it, else 0
+            trend = TRENDS[int(prediction > current_price * 1.05) - int(prediction < current_price * 0.95)]
+
+            # Round once for both the response and the stored history
+            rounded_prediction = round(prediction, 2)
 
             # Store prediction
             self.prediction_history.append({
                 'timestamp': timestamp,
-                'prediction': prediction,
+                'prediction': rounded_prediction,
                 'confidence': confidence
             })
 
             prediction_data = {
-                "short_term_prediction": round(float(prediction), 2),
+                "short_term_prediction": rounded_prediction,
                 "confidence": confidence,
                 "trend": trend,
                 "next_hour_range": {
@@ -1,8 +1,8 @@
-from typing import Dict, List, Type, Any
+import asyncio
+from typing import Dict, List, Type, Any, Optional, Tuple
 import logging
-import os
 from datetime import datetime
-from .base_module import BaseModule
+from .base_module import BaseModule, admin_chat_id
 
 logger = logging.getLogger(__name__)
 
@@ -11,9 +11,16 @@ class ModuleManager:
 
     def __init__(self):
         self.modules: Dict[str, BaseModule] = {}
+        # Enabled modules by name, kept in step by register/enable/disable_module
+        self._enabled: Dict[str, BaseModule] = {}
+        # Dispatch list built from _enabled on first use after a change
+        self._enabled_modules: Optional[List[Tuple[str, BaseModule]]] = None
         self.module_errors: Dict[str, List[Dict[str, Any]]] = {}
-        self.admin_chat_id = os.environ.get('ADMIN_CHAT_ID')
+        self.admin_chat_id = admin_chat_id()
         self._notification_callback = None
+        # Long-running processes get the feature modules imported before first use
+        from . import warm_modules
+        warm_modules()
 
     def register_module(self, module: BaseModule) -> bool:
         """Register a new module"""
@@ -23,6 +30,9 @@ class ModuleManager:
                 return False
 
             self.modules[module.name] = module
+            if module.is_enabled():
+                self._enabled[module.name] = module
+                self._enabled_modules = None
             self.module_errors[module.name] = []
             logger.info(f"Registered module: {module.name}")
             return True
@@ -52,7 +62,10 @@ class ModuleManager:
             return False
 
         try:    
-            self.modules[module_name].enable()
+            module = self.modules[module_name]
+            module.enable()
+            self._enabled[module_name] = module
+            self._enabled_modules = None
             logger.info(f"Module {module_name} enabled successfully")
             return True
         except Exception as e:
@@ -67,6 +80,8 @@ class ModuleManager:
 
         try:
             self.modules[module_name].disable()
+            self._enabled.pop(module_name, None)
+            self._enabled_modules = None
             logger.info(f"Module {module_name} disabled successfully")
             return True
         except Exception as e:
@@ -75,7 +90,13 @@ class ModuleManager:
 
     def get_enabled_modules(self) -> List[str]:
         """Get list of enabled module names"""
-        return [name for name, module in self.modules.items() if module.is_enabled()]
+        return list(self._enabled)
+
+    def _dispatch_list(self) -> List[Tuple[str, BaseModule]]:
+        """Enabled (name, module) pairs, rebuilt only after an enable/disable/register"""
+        if self._enabled_modules is None:
+            self._enabled_modules = list(self._enabled.items())
+        return self._enabled_modules
 
     def get_all_modules(self) -> List[Dict[str, Any]]:
         """Get information about all registered modules"""
@@ -90,55 +111,71 @@ class ModuleManager:
         ]
 
     async def process_with_enabled_modules(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Process data through all enabled modules with error handling"""
+        """Process data through all enabled modules concurrently with error handling"""
         results = {}
-
-        for name, module in self.modules.items():
-            if module.is_enabled():
-                try:
-                    logger.info(f"Processing data with module: {name}")
-                    results[name] = await module.process(data)
-                    # Clear any previous errors if successful
-                    self._clear_module_errors(name)
-                    logger.info(f"Successfully processed data with module: {name}")
-                except Exception as e:
-                    error_msg = f"Error processing in module {name}: {str(e)}"
-                    logger.error(error_msg)
-                    self._record_module_error(name, str(e))
-                    await self._notify_admin(f"⚠️ Module {name} failed: {str(e)}")
-
-                    # For core price_monitor module, raise the error
-                    if name == "price_monitor":
-                        logger.error("Critical error in price_monitor module")
-                        raise
-
-                    # For other modules, continue with partial results
-                    results[name] = {"error": str(e)}
-                    logger.warning(f"Continuing execution without module {name}")
+        enabled = self._dispatch_list()
+
+        for name, _ in enabled:
+            logger.info(f"Processing data with module: {name}")
+        # Modules are independent, so the cycle takes as long as the slowest one
+        outcomes = await asyncio.gather(
+            *(module.process(data) for _, module in enabled), return_exceptions=True
+        )
+
+        critical_error = None
+        for (name, _), outcome in zip(enabled, outcomes):
+            if not isinstance(outcome, Exception):
+                results[name] = outcome
+                # Clear any previous errors if successful
+                self._clear_module_errors(name)
+                logger.info(f"Successfully processed data with module: {name}")
+                continue
+
+            error_msg = f"Error processing in module {name}: {str(outcome)}"
+            logger.error(error_msg)
+            self._record_module_error(name, str(outcome))
+            await self._notify_admin(f"⚠️ Module {name} failed: {str(outcome)}")
+
+            # For core price_monitor module, raise the error once every result is recorded
+            if name == "price_monitor":
+                logger.error("Critical error in price_monitor module")
+                critical_error = outcome
+                continue
+
+            # For other modules, continue with partial results
+            results[name] = {"error": str(outcome)}
+            logger.warning(f"Continuing execution without module {name}")
+
+        if critical_error is not None:
+            raise critical_error
 
         return results
 
     async def get_notification_data(self) -> Dict[str, Any]:
-        """Get notification data from all enabled modules with error handling"""
+        """Get notification data from all enabled modules concurrently with error handling"""
         notification_data = {}
-
-        for name, module in self.modules.items():
-            if module.is_enabled():
-                try:
-                    logger.info(f"Getting notification data from module: {name}")
-                    module_data = await module.get_notification_data()
-                    if module_data:
-                        notification_data[name] = module_data
-                        logger.info(f"Successfully got notification data from module: {name}")
-                except Exception as e:
-                    error_msg = f"Error getting notification data from {name}: {str(e)}"
-                    logger.error(error_msg)
-                    self._record_module_error(name, str(e))
-                    await self._notify_admin(f"⚠️ Module {name} notification failed: {str(e)}")
-
-                    # Skip failed module's data without breaking functionality
-                    logger.warning(f"Skipping notification data from module {name}")
-                    continue
+        enabled = self._dispatch_list()
+
+        for name, _ in enabled:
+            logger.info(f"Getting notification data from module: {name}")
+        outcomes = await asyncio.gather(
+            *(module.get_notification_data() for _, module in enabled), return_exceptions=True
+        )
+
+        for (name, _), outcome in zip(enabled, outcomes):
+            if isinstance(outcome, Exception):
+                error_msg = f"Error getting notification data from {name}: {str(outcome)}"
+                logger.error(error_msg)
+                self._record_module_error(name, str(outcome))
+                await self._notify_admin(f"⚠️ Module {name} notification failed: {str(outcome)}")
+
+                # Skip failed module's data without breaking functionality
+                logger.warning(f"Skipping notification data from module {name}")
+                continue
+
+            if outcome:
+                notification_data[name] = outcome
+                logger.info(f"Successfully got notification data from module: {name}")
 
         return notification_data
 
@@ -1,19 +1,25 @@
 from typing import Dict, Any, Optional
 import logging
+import numpy as np
 from datetime import datetime, timedelta
 from .base_module import BaseModule
+from .price_series import PriceSeries, TRENDS
 
 logger = logging.getLogger(__name__)
 
+CYCLE_POWER_RATIO = 3.0  # How far a 6-8 hour component must stand above the average spectrum
+
 class PatternAnalysisModule(BaseModule):
     """Module for analyzing price patterns and trends"""
+
+    __slots__ = ("price_history", "analysis_window")
     
     def __init__(self):
         super().__init__(
             name="pattern_analysis",
             description="Analyzes price patterns and provides insights"
         )
-        self.price_history = []
+        self.price_history = PriceSeries()
         self.analysis_window = timedelta(hours=24)
         
     async def initialize(self) -> bool:
@@ -32,10 +38,7 @@ class PatternAnalysisModule(BaseModule):
             timestamp = data.get('timestamp', datetime.now())
             
             # Add to price history
-            self.price_history.append({
-                'price': current_price,
-                'timestamp': timestamp
-            })
+            self.price_history.append(current_price, timestamp)
             
             # Clean old data
             self._clean_old_data()
@@ -43,7 +46,7 @@ class PatternAnalysisModule(BaseModule):
             # Analyze patterns
             volatility = self._calculate_volatility()
             trend = self._determine_trend()
-            patterns = self._detect_patterns()
+            patterns = self._detect_patterns(volatility)
             
             return {
                 "status": "success",
@@ -67,14 +70,13 @@ class PatternAnalysisModule(BaseModule):
             return None
             
         try:
-            latest = self.price_history[-1]
             volatility = self._calculate_volatility()
             trend = self._determine_trend()
             
             return {
                 "current_trend": trend,
                 "volatility": volatility,
-                "timestamp": latest['timestamp']
+                "timestamp": self.price_history.last_timestamp()
             }
         except Exception as e:
             logger.error(f"Error getting notification data: {str(e)}")
@@ -82,37 +84,25 @@ class PatternAnalysisModule(BaseModule):
             
     def _clean_old_data(self):
         """Remove data points older than the analysis window"""
-        cutoff = datetime.now() - self.analysis_window
-        self.price_history = [
-            point for point in self.price_history 
-            if point['timestamp'] > cutoff
-        ]
+        self.price_history.prune(datetime.now() - self.analysis_window)
             
     def _calculate_volatility(self) -> float:
-        """Calculate price volatility"""
+        """Calculate price volatility (population standard deviation)"""
         if len(self.price_history) < 2:
             return 0.0
-            
-        prices = [point['price'] for point in self.price_history]
-        mean = sum(prices) / len(prices)
-        squared_diff = sum((p - mean) ** 2 for p in prices)
-        return (squared_diff / len(prices)) ** 0.5
+        return float(self.price_history.prices.std(dtype=np.float64))
             
     def _determine_trend(self) -> str:
         """Determine the current price trend"""
         if len(self.price_history) < 2:
             return "unknown"
             
-        recent_prices = [point['price'] for point in self.price_history[-3:]]
-        
-        if all(x < y for x, y in zip(recent_prices, recent_prices[1:])):
-            return "rising"
-        elif all(x > y for x, y in zip(recent_prices, recent_prices[1:])):
-            return "falling"
-        return "stable"
+        diffs = np.diff(self.price_history.prices[-3:])
+        # +1 if every step rose, -1 if every step fell, else 0
+        return TRENDS[int((diffs > 0).all()) - int((diffs < 0).all())]
             
-    def _detect_patterns(self) -> Dict[str, Any]:
-        """Detect specific price patterns"""
+    def _detect_patterns(self, volatility: Optional[float] = None) -> Dict[str, Any]:
+        """Detect specific price patterns (volatility is the std already computed this tick, if any)"""
         if len(self.price_history) < 12:
             return {"detected": [], "confidence": 0}
             
@@ -120,19 +110,20 @@ class PatternAnalysisModule(BaseModule):
         confidence = 0
         
         # Detect price spikes
-        prices = [point['price'] for point in self.price_history]
-        mean = sum(prices) / len(prices)
-        std_dev = (sum((p - mean) ** 2 for p in prices) / len(prices)) ** 0.5
-        
+        prices = self.price_history.prices
+        mean = prices.mean(dtype=np.float64)
+        std_dev = self._calculate_volatility() if volatility is None else volatility
+
         if abs(prices[-1] - mean) > 2 * std_dev:
             patterns.append("price_spike")
             confidence = 80
             
-        # Detect cyclic patterns (simplified)
+        # Detect cyclic patterns: a dominant 6-8 hour component in the last day's spectrum
         if len(self.price_history) >= 24:
-            hourly_prices = prices[-24:]
-            peaks = [i for i in range(1, 23) if hourly_prices[i] > hourly_prices[i-1] and hourly_prices[i] > hourly_prices[i+1]]
-            if len(peaks) >= 2 and abs(peaks[-1] - peaks[-2]) in (5, 6, 7):
+            hourly_prices = prices[-24:].astype(np.float64)
+            # Bin k of a 24-point transform is a 24/k hour period; bins 3-4 cover 8 and 6 hours
+            spectrum = np.abs(np.fft.rfft(hourly_prices - hourly_prices.mean()))
+            if spectrum[3:5].max() > CYCLE_POWER_RATIO * spectrum[1:].mean():
                 patterns.append("cyclic_pattern")
                 confidence = max(confidence, 70)
                 
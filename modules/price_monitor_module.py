@@ -1,15 +1,48 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+import asyncio
 import logging
+import time
 from datetime import datetime
-import requests
+import aiohttp
+from utils.http_client import RateLimiter, get_json, retire_session
 from .base_module import BaseModule
 from .errors import ModuleError
 
 logger = logging.getLogger(__name__)
 
+# Seconds a fetched feed is reused; ComEd refreshes the 5-minute feed more often than the hourly average
+FEED_CACHE_TTLS = {"hourly": 60, "5min": 30, "daily": 300}
+
+# Shared across instances so concurrent modules can't burst past ComEd's limits
+_COMED_LIMITER = RateLimiter(5)
+
+# Shared HTTP session so feed fetches reuse keep-alive connections
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the module session, creating it for the running event loop if needed"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None:
+            retire_session(_session, _session_loop)
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        _session_loop = loop
+    return _session
+
+async def _fetch_json(url: str) -> Optional[Any]:
+    """GET a URL on the shared session and decode the JSON body (None on a non-200 reply)"""
+    return await get_json(_get_session(), url, _COMED_LIMITER)
+
 class PriceMonitorModule(BaseModule):
     """Module for monitoring real-time energy prices"""
 
+    __slots__ = ("last_price", "last_update", "provider", "api_endpoints", "_feed_cache", "_feed_fetches")
+
     def __init__(self):
         super().__init__(
             name="price_monitor",
@@ -23,6 +56,18 @@ class PriceMonitorModule(BaseModule):
             "5min": "https://hourlypricing.comed.com/api?type=5minutefeed",
             "daily": "https://hourlypricing.comed.com/api?type=day"
         }
+        # Feed name -> (monotonic fetch time, JSON payload) for successful fetches
+        self._feed_cache: Dict[str, Tuple[float, Any]] = {}
+        # Feed name -> fetch in progress, shared by concurrent callers so each feed is requested once
+        self._feed_fetches: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    async def close():
+        """Close the shared HTTP session"""
+        global _session
+        if _session is not None and not _session.closed:
+            await _session.close()
+        _session = None
 
     async def initialize(self) -> bool:
         """Initialize price monitoring"""
@@ -34,15 +79,35 @@ class PriceMonitorModule(BaseModule):
             logger.error(f"Failed to initialize price monitor: {str(e)}")
             return False
 
+    async def _fetch_feed(self, feed: str) -> Optional[Any]:
+        """Get a feed's JSON (None if the request fails), reusing a fetch younger than its FEED_CACHE_TTLS entry"""
+        cached = self._feed_cache.get(feed)
+        if cached and time.monotonic() - cached[0] < FEED_CACHE_TTLS[feed]:
+            return cached[1]
+
+        # Join a fetch already in flight rather than issuing a second request
+        fetch = self._feed_fetches.get(feed)
+        if fetch is None or fetch.done():
+            fetch = asyncio.ensure_future(self._refresh_feed(feed))
+            self._feed_fetches[feed] = fetch
+        # Shielded so one caller being cancelled doesn't cancel the fetch for the others
+        return await asyncio.shield(fetch)
+
+    async def _refresh_feed(self, feed: str) -> Optional[Any]:
+        """Fetch a feed from the provider and cache it on success"""
+        data = await _fetch_json(self.api_endpoints[feed])
+        if data is not None:
+            self._feed_cache[feed] = (time.monotonic(), data)
+        return data
+
     async def _update_price_data(self) -> bool:
         """Update price data from provider"""
         try:
             logger.info("Attempting to update price data")
 
             # Try to get current hour average first
-            response = requests.get(self.api_endpoints["hourly"])
-            if response.status_code == 200:
-                data = response.json()
+            data = await self._fetch_feed("hourly")
+            if data is not None:
                 if isinstance(data, list) and len(data) > 0:
                     self.last_price = float(data[0].get('price', 0))
                     self.last_update = datetime.utcnow()
@@ -50,9 +115,8 @@ class PriceMonitorModule(BaseModule):
                     return True
 
             # If hourly fails, try 5-minute data
-            response = requests.get(self.api_endpoints["5min"])
-            if response.status_code == 200:
-                data = response.json()
+            data = await self._fetch_feed("5min")
+            if data is not None:
                 if isinstance(data, list) and len(data) > 0:
                     self.last_price = float(data[0].get('price', 0))
                     self.last_update = datetime.utcnow()
@@ -80,16 +144,23 @@ class PriceMonitorModule(BaseModule):
                 logger.error(error_msg)
                 raise ModuleError(error_msg)
 
-            # Get additional data for comprehensive price info
-            hourly_response = requests.get(self.api_endpoints["hourly"])
-            five_min_response = requests.get(self.api_endpoints["5min"])
+            # Get additional data for comprehensive price info; hourly is usually cached from above
+            feeds = ("hourly", "5min")
+            fetched = await asyncio.gather(*(self._fetch_feed(feed) for feed in feeds), return_exceptions=True)
+            # A failed feed only loses its own detail; the current price is already known
+            for feed, outcome in zip(feeds, fetched):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"Failed to fetch {feed} feed: {str(outcome)}")
+            hourly_data, five_min_data = (
+                [] if outcome is None or isinstance(outcome, Exception) else outcome for outcome in fetched
+            )
 
             result = {
                 "status": "success",
                 "current_price": self.last_price,
                 "timestamp": self.last_update.isoformat() if self.last_update else None,
-                "hourly_data": hourly_response.json() if hourly_response.status_code == 200 else [],
-                "five_min_data": five_min_response.json() if five_min_response.status_code == 200 else []
+                "hourly_data": hourly_data,
+                "five_min_data": five_min_data
             }
 
             logger.info(f"Successfully processed price data: {result}")
@@ -163,12 +234,8 @@ class PriceMonitorModule(BaseModule):
 
             # Get hourly average
             try:
-                response = requests.get(self.api_endpoints["hourly"])
-                if response.status_code == 200:
-                    data = response.json()
-                    average_price = float(data[0].get('price', 0)) if data else None
-                else:
-                    average_price = None
+                data = await self._fetch_feed("hourly")
+                average_price = float(data[0].get('price', 0)) if data else None
             except Exception as e:
                 logger.error(f"Error getting average price: {str(e)}")
                 average_price = None
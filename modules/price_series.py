@@ -0,0 +1,51 @@
+from datetime import datetime
+import numpy as np
+
+# Trend labels indexed by direction: 0 stable, +1 rising, -1 falling
+TRENDS = ("stable", "rising", "falling")
+
+class PriceSeries:
+    """Price points kept as parallel NumPy arrays of prices and timestamps, in arrival order
+
+    Prices are stored as float32: ample for cents/kWh values and half the memory of float64.
+    Callers that reduce over them should accumulate in float64.
+    """
+
+    __slots__ = ("_prices", "_times", "_size")
+
+    def __init__(self, capacity: int = 64):
+        self._prices = np.empty(capacity, dtype=np.float32)
+        self._times = np.empty(capacity, dtype="datetime64[us]")
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, price: float, timestamp: datetime):
+        """Add a price point, doubling the arrays when they are full"""
+        if self._size == len(self._prices):
+            self._prices = np.resize(self._prices, 2 * self._size)
+            self._times = np.resize(self._times, 2 * self._size)
+        self._prices[self._size] = price
+        self._times[self._size] = np.datetime64(timestamp, "us")
+        self._size += 1
+
+    def prune(self, cutoff: datetime):
+        """Drop points with a timestamp at or before cutoff"""
+        keep = self._times[:self._size] > np.datetime64(cutoff, "us")
+        kept = int(np.count_nonzero(keep))
+        if kept == self._size:
+            return
+        # Boolean indexing copies, so compacting in place is safe
+        self._prices[:kept] = self._prices[:self._size][keep]
+        self._times[:kept] = self._times[:self._size][keep]
+        self._size = kept
+
+    @property
+    def prices(self) -> np.ndarray:
+        """View of the stored prices (do not keep it across appends)"""
+        return self._prices[:self._size]
+
+    def last_timestamp(self) -> datetime:
+        """Timestamp of the most recently added point"""
+        return self._times[self._size - 1].astype(datetime)
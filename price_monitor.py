@@ -1,13 +1,63 @@
-import requests
+import aiohttp
+import asyncio
 import json
 from datetime import datetime
 import logging
+from typing import Optional
 from config import FIVE_MIN_PRICE_URL, HOURLY_PRICE_URL, MIN_RATE
+from utils.http_client import RateLimiter, get_json, retire_session
 from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
+_CST = ZoneInfo("America/Chicago")  # ComEd reports prices in Chicago local time
+
+# Characters removed from price strings in one str.translate pass
+_PRICE_STRIP = str.maketrans("", "", "¢ \t\r\n")
+_MISSING_PRICES = frozenset({"n/a", "none", ""})
+
+# Spaces out calls to the price API so concurrent commands don't trigger 429s
+_limiter = RateLimiter(5)
+
+# Shared HTTP session so upstream calls reuse keep-alive connections
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the module session, creating it for the running event loop if needed"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None:
+            retire_session(_session, _session_loop)
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+        _session_loop = loop
+    return _session
+
+async def _fetch_json(url: str):
+    """GET a URL on the shared session and decode the JSON body"""
+    data = await get_json(_get_session(), url, _limiter)
+    if data is None:
+        raise ValueError(f"Request to {url} failed")
+    return data
+
+def _hour_key(date_time: str) -> str:
+    """Normalise an hourly feed DateTime such as '8:00 AM' to the '08:00 AM' form of the current hour"""
+    hour = date_time.partition(":")[0]
+    return f"{hour.zfill(2)}:00 {date_time.split()[-1]}"
+
 class PriceMonitor:
+    @staticmethod
+    async def close():
+        """Close the shared HTTP session"""
+        global _session
+        if _session is not None and not _session.closed:
+            await _session.close()
+        _session = None
+
     @staticmethod
     def clean_price_string(price_str):
         """Clean price string by removing '¢' symbol and converting to float"""
@@ -17,16 +67,24 @@ class PriceMonitor:
                 return float(price_str)
 
             # Handle None, empty string, or 'n/a'
-            if not price_str or str(price_str).lower() in ['n/a', 'none', '']:
-                return None  # Return None instead of 0.0 for invalid values
+            if not price_str:
+                return None
 
             # Remove '¢' symbol and any whitespace
-            cleaned = str(price_str).replace('¢', '').strip()
+            cleaned = str(price_str).translate(_PRICE_STRIP)
+            if cleaned.lower() in _MISSING_PRICES:
+                return None  # Return None instead of 0.0 for invalid values
             return float(cleaned)
         except (ValueError, AttributeError) as e:
             logger.error(f"Error cleaning price string '{price_str}': {str(e)}")
             return None
 
+    @staticmethod
+    def clean_prices(price_strs):
+        """Clean a batch of price strings (None for each invalid value)"""
+        clean = PriceMonitor.clean_price_string
+        return [clean(p) for p in price_strs]
+
     @staticmethod
     def _parse_price_time(time_str):
         """Parse time string in various formats and return datetime object"""
@@ -51,7 +109,7 @@ class PriceMonitor:
                     time_obj = datetime.strptime(time_str.strip(), fmt)
                     if fmt == "%I:%M %p":
                         # For time-only format, use current date
-                        current = datetime.now(ZoneInfo("America/Chicago"))
+                        current = datetime.now(_CST)
                         time_obj = time_obj.replace(
                             year=current.year,
                             month=current.month,
@@ -60,17 +118,17 @@ class PriceMonitor:
                         )
                     else:
                         # Add timezone info
-                        time_obj = time_obj.replace(tzinfo=ZoneInfo("America/Chicago"))
+                        time_obj = time_obj.replace(tzinfo=_CST)
                     return time_obj
                 except ValueError:
                     continue
 
             logger.error(f"Could not parse time string: {time_str}")
-            return datetime.now(ZoneInfo("America/Chicago"))
+            return datetime.now(_CST)
 
         except Exception as e:
             logger.error(f"Error parsing time string '{time_str}': {str(e)}")
-            return datetime.now(ZoneInfo("America/Chicago"))
+            return datetime.now(_CST)
 
 
     @staticmethod
@@ -94,9 +152,7 @@ class PriceMonitor:
     async def check_five_min_price():
         """Fetch and process 5-minute price data"""
         try:
-            response = requests.get(FIVE_MIN_PRICE_URL)
-            response.raise_for_status()
-            data = response.json()
+            data = await _fetch_json(FIVE_MIN_PRICE_URL)
 
             if not data:
                 raise ValueError("Empty response from five minute price API")
@@ -107,10 +163,7 @@ class PriceMonitor:
             formatted_time_str = formatted_time.strftime('%Y-%m-%d %I:%M %p %Z') if formatted_time else None
 
             # Calculate trend using valid prices only
-            recent_prices = [
-                PriceMonitor.clean_price_string(p.get('price'))
-                for p in data[:5]
-            ]
+            recent_prices = PriceMonitor.clean_prices(p.get('price') for p in data[:5])
             trend = PriceMonitor.determine_price_trend(cleaned_price, recent_prices)
 
             return {
@@ -126,7 +179,7 @@ class PriceMonitor:
             }
         except Exception as e:
             logger.error(f"Error fetching 5-minute price: {str(e)}")
-            current_time = datetime.now(ZoneInfo("America/Chicago"))
+            current_time = datetime.now(_CST)
             return {
                 'price': "N/A",
                 'time': current_time.strftime('%Y-%m-%d %I:%M %p %Z'),
@@ -139,31 +192,24 @@ class PriceMonitor:
     async def check_hourly_price():
         """Fetch and process hourly price data"""
         try:
-            cst_now = datetime.now(ZoneInfo("America/Chicago"))
+            cst_now = datetime.now(_CST)
             today_date = cst_now.strftime("%Y%m%d")
             current_hour = cst_now.strftime("%I:00 %p")
 
-            logger.info(f"Current time in CST: {cst_now.strftime('%Y-%m-%d %I:%M %p %Z')}")
+            logger.info("Current time in CST: %s", cst_now.isoformat(timespec='minutes'))
             api_url = f"{HOURLY_PRICE_URL}?queryDate={today_date}"
 
-            response = requests.get(api_url)
-            response.raise_for_status()
-            data = response.json()
+            data = await _fetch_json(api_url)
 
             if not data:
                 raise ValueError("Empty response from hourly price API")
 
-            # Find the current hour's data
-            current_data = [
-                entry for entry in data
-                if entry["DateTime"].split(":")[0].zfill(2) + ":00 " + entry["DateTime"].split()[-1] == current_hour
-            ]
+            # Find the current hour's data, stopping at the first match
+            hour_data = next((entry for entry in data if _hour_key(entry["DateTime"]) == current_hour), None)
 
-            if not current_data:
+            if hour_data is None:
                 logger.warning(f"No data found for current hour: {current_hour}")
                 raise ValueError(f"No data found for current hour: {current_hour}")
-
-            hour_data = current_data[0]
             cleaned_price = PriceMonitor.clean_price_string(hour_data.get('RealTimePrice'))
             cleaned_day_ahead = PriceMonitor.clean_price_string(hour_data.get('DayAheadPrice'))
             formatted_time = PriceMonitor._parse_price_time(hour_data.get('DateTime'))
@@ -180,9 +226,8 @@ class PriceMonitor:
 
             # Calculate trend using valid prices only
             recent_prices = [
-                PriceMonitor.clean_price_string(entry.get('RealTimePrice'))
-                for entry in data[-3:]
-                if PriceMonitor.clean_price_string(entry.get('RealTimePrice')) is not None
+                price for price in PriceMonitor.clean_prices(entry.get('RealTimePrice') for entry in data[-3:])
+                if price is not None
             ]
             trend = PriceMonitor.determine_price_trend(cleaned_price, recent_prices)
 
@@ -202,7 +247,7 @@ class PriceMonitor:
             }
         except Exception as e:
             logger.error(f"Error fetching hourly price: {str(e)}")
-            current_time = datetime.now(ZoneInfo("America/Chicago"))
+            current_time = datetime.now(_CST)
             return {
                 'price': "N/A",
                 'day_ahead_price': "N/A",
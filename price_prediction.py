@@ -1,4 +1,5 @@
 import logging
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
@@ -6,8 +7,10 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error
 from scipy.stats import entropy
+from flask import has_app_context
 from app import app
 from models import PriceHistory
+from database import db
 
 # Configure logging
 logging.basicConfig(
@@ -16,6 +19,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _app_context():
+    """Reuse the active application context, pushing a new one only when needed"""
+    return nullcontext() if has_app_context() else app.app_context()
+
 class PricePredictionModel:
     def __init__(self):
         self.model = RandomForestRegressor(
@@ -120,10 +127,15 @@ class PricePredictionModel:
 
     async def _get_training_data(self):
         """Get historical price data for training"""
-        with app.app_context():
+        with _app_context():
             # Get last 30 days of price history
             cutoff_time = datetime.utcnow() - timedelta(days=30)
-            history = PriceHistory.query.filter(
+            # Select only the columns the model uses rather than full rows
+            history = db.session.query(
+                PriceHistory.timestamp,
+                PriceHistory.hourly_price,
+                PriceHistory.prediction_accuracy
+            ).filter(
                 PriceHistory.timestamp >= cutoff_time,
                 PriceHistory.provider == "ComEd"
             ).order_by(PriceHistory.timestamp.asc()).all()
@@ -132,11 +144,7 @@ class PricePredictionModel:
                 raise ValueError("No historical data available for training")
 
             # Convert to DataFrame
-            data = pd.DataFrame([{
-                'timestamp': h.timestamp,
-                'hourly_price': h.hourly_price,
-                'prediction_accuracy': h.prediction_accuracy
-            } for h in history])
+            data = pd.DataFrame(history, columns=['timestamp', 'hourly_price', 'prediction_accuracy'])
 
             return data
 
@@ -176,34 +184,35 @@ class PricePredictionModel:
     async def predict(self, current_price, timestamp=None):
         """Generate price predictions with pattern analysis"""
         try:
-            if not self.is_trained:
-                if not await self.train():
-                    raise ValueError("Could not train model")
+            # Push one application context for training and the history lookup
+            with _app_context():
+                if not self.is_trained:
+                    if not await self.train():
+                        raise ValueError("Could not train model")
 
-            timestamp = timestamp or datetime.utcnow()
+                timestamp = timestamp or datetime.utcnow()
 
-            # Create a DataFrame with current data
-            current_data = pd.DataFrame([{
-                'timestamp': timestamp,
-                'hourly_price': current_price
-            }])
+                # Create a DataFrame with current data
+                current_data = pd.DataFrame([{
+                    'timestamp': timestamp,
+                    'hourly_price': current_price
+                }])
 
-            # Add historical context
-            with app.app_context():
+                # Add historical context
                 history_cutoff = timestamp - timedelta(hours=24)
-                historical_prices = PriceHistory.query.filter(
+                historical_prices = db.session.query(
+                    PriceHistory.timestamp,
+                    PriceHistory.hourly_price
+                ).filter(
                     PriceHistory.timestamp >= history_cutoff,
                     PriceHistory.provider == "ComEd"
                 ).order_by(PriceHistory.timestamp.desc()).all()
 
-                for h in historical_prices:
+                if historical_prices:
                     current_data = pd.concat([
                         current_data,
-                        pd.DataFrame([{
-                            'timestamp': h.timestamp,
-                            'hourly_price': h.hourly_price
-                        }])
-                    ])
+                        pd.DataFrame(historical_prices, columns=['timestamp', 'hourly_price'])
+                    ], ignore_index=True)
 
             # Prepare features
             X = self._prepare_features(current_data.sort_values('timestamp'))
@@ -22,14 +22,14 @@ class PriceDataScheduler:
                 current_average = self.provider.get_current_average()
 
                 if hourly_prices:
-                    # Store the most recent price
+                    # Store the most recent price; a re-fetched hour updates its row
                     latest_price = hourly_prices[0]
-                    PriceHistory.add_price_data(
-                        provider=self.provider.get_provider_name(),
-                        hourly_price=latest_price['price'],
-                        hourly_average=current_average,
-                        timestamp=datetime.fromisoformat(latest_price['timestamp'])
-                    )
+                    PriceHistory.add_price_data_bulk([{
+                        "provider": self.provider.get_provider_name(),
+                        "hourly_price": latest_price['price'],
+                        "hourly_average": current_average,
+                        "timestamp": datetime.fromisoformat(latest_price['timestamp'])
+                    }])
                     logger.info(
                         f"Stored price data: {latest_price['price']}¢ "
                         f"(avg: {current_average}¢) "
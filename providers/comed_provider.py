@@ -1,13 +1,16 @@
 import logging
 from datetime import datetime
-import requests
 import trafilatura
 from typing import Dict, Any, List
 from bs4 import BeautifulSoup
+from utils.http_client import HTTP_TIMEOUT, pooled_session
 from .base_provider import EnergyProvider
 
 logger = logging.getLogger(__name__)
 
+# Every ComEd API call goes to one host, so share its keep-alive connections
+_session = pooled_session()
+
 class ComedProvider(EnergyProvider):
     """ComEd energy provider implementation"""
     
@@ -77,7 +80,7 @@ class ComedProvider(EnergyProvider):
         Returns the average price as a float
         """
         try:
-            response = requests.get(f"{self.hourly_api_url}?type=currenthouraverage")
+            response = _session.get(f"{self.hourly_api_url}?type=currenthouraverage", timeout=HTTP_TIMEOUT)
             response.raise_for_status()
             
             # API returns a list with a single value
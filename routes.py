@@ -1,5 +1,7 @@
 from flask import jsonify, render_template
+from sqlalchemy import text
 from app import app
+from database import db
 from agents.agent_manager import AgentManager
 from agents.live_price_agent import LivePriceAgent
 import logging
@@ -67,6 +69,19 @@ async def get_live_price():
             'status': 'error'
         }), 500
 
+@app.route('/healthz')
+def healthz():
+    """Database health check; also keeps pooled connections warm"""
+    try:
+        db.session.execute(text("SELECT 1"))
+        return jsonify({'status': 'ok'})
+    except Exception as e:
+        logger.error(f"Health check failed: {str(e)}; pool status: {db.engine.pool.status()}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 503
+
 # Root route shows the agent monitor
 @app.route('/')
 def index():
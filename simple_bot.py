@@ -1,8 +1,8 @@
 import os
+import asyncio
 import logging
 from telegram import Update
 from telegram.ext import Application, CommandHandler, ContextTypes
-import requests
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from price_monitor import PriceMonitor
@@ -15,6 +15,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Display timezone, resolved once at import
+CST = ZoneInfo("America/Chicago")
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send a message when the command /start is issued."""
     chat_id = update.effective_chat.id
@@ -32,19 +35,29 @@ async def check_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         await update.message.reply_text("🔍 Checking current prices...")
         
-        # Get price data
-        hourly_data = await PriceMonitor.check_hourly_price()
-        five_min_data = await PriceMonitor.check_five_min_price()
-        
-        # Format message
-        message = "📊 Current Energy Prices:\n\n"
-        message += f"5-min price: {five_min_data.get('price', 'N/A')}¢\n"
-        message += f"Hourly price: {hourly_data.get('price', 'N/A')}¢\n"
-        message += f"Trend: {hourly_data.get('trend', 'unknown').capitalize()}\n\n"
+        # Get price data; both feeds are independent so fetch them concurrently
+        hourly_data, five_min_data = await asyncio.gather(
+            PriceMonitor.check_hourly_price(),
+            PriceMonitor.check_five_min_price(),
+            return_exceptions=True
+        )
+        if isinstance(hourly_data, Exception):
+            logger.error(f"Error fetching hourly price: {str(hourly_data)}")
+            hourly_data = {}
+        if isinstance(five_min_data, Exception):
+            logger.error(f"Error fetching 5-minute price: {str(five_min_data)}")
+            five_min_data = {}
         
-        # Add timestamp
-        cst_time = datetime.now(ZoneInfo("America/Chicago"))
-        message += f"⏰ Last Updated: {cst_time.strftime('%Y-%m-%d %I:%M %p %Z')}"
+        # Format message with timestamp
+        trend = hourly_data.get('trend', 'unknown').capitalize()
+        cst_time = datetime.now(CST)
+        message = (
+            "📊 Current Energy Prices:\n\n"
+            f"5-min price: {five_min_data.get('price', 'N/A')}¢\n"
+            f"Hourly price: {hourly_data.get('price', 'N/A')}¢\n"
+            f"Trend: {trend}\n\n"
+            f"⏰ Last Updated: {cst_time.strftime('%Y-%m-%d %I:%M %p %Z')}"
+        )
         
         await update.message.reply_text(message)
         
@@ -53,6 +66,10 @@ async def check_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
         logger.error(error_msg)
         await update.message.reply_text(error_msg)
 
+async def shutdown(application: Application):
+    """Release pooled HTTP connections when the bot stops."""
+    await PriceMonitor.close()
+
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send a message when the command /help is issued."""
     await start(update, context)
@@ -61,7 +78,7 @@ def main():
     """Start the bot."""
     try:
         # Create the Application
-        application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_shutdown(shutdown).build()
 
         # Add handlers
         application.add_handler(CommandHandler("start", start))
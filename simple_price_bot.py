@@ -1,12 +1,17 @@
 import os
+import re
+import time
+import asyncio
 import logging
+from typing import Any, Dict, List, Optional, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from price_monitor import PriceMonitor
 from models import PriceHistory
 from app import app, db
+from utils.batch_writer import BatchWriter
 
 # Configure logging
 logging.basicConfig(
@@ -16,11 +21,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Display timezone, resolved once at import
+CST = ZoneInfo("America/Chicago")
+
 # Get bot token from environment
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
 if not TELEGRAM_BOT_TOKEN:
     raise ValueError("TELEGRAM_BOT_TOKEN environment variable is not set")
 
+# Callback data sent by the prediction feedback buttons
+FEEDBACK_PATTERN = re.compile(r"^feedback_(accurate|inaccurate)_(\d+)$")
+
+# Predictions are refreshed in the background every PREFETCH_INTERVAL seconds;
+# the TTL leaves some slack so a slightly late job never causes a miss
+PREFETCH_INTERVAL = 300
+PREDICTION_TTL = PREFETCH_INTERVAL + 60
+
+# Most recent (monotonic timestamp, prediction) pair
+_cached_prediction: Optional[Tuple[float, Dict[str, Any]]] = None
+
+# Price feed served by this bot
+PROVIDER = "ComEd"
+
+# Refreshes currently running, keyed by (provider, minute bucket), so that
+# concurrent /check commands share a single fetch
+_inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send a message when the command /start is issued."""
     chat_id = update.effective_chat.id
@@ -37,25 +63,104 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send help message"""
     await start(update, context)
 
+def _db_store_predictions(predictions: List[Tuple[float, float, float]]) -> List[Optional[int]]:
+    """Store (current, predicted, confidence) prediction records with one commit and return their ids (runs in a worker thread)"""
+    with app.app_context():
+        try:
+            # Rows are unique per (provider, timestamp), so space the batch a microsecond apart
+            stored_at = datetime.utcnow()
+            records = [
+                PriceHistory.add_price_data(
+                    hourly_price=current_price,
+                    predicted_price=predicted_price,
+                    prediction_confidence=confidence,
+                    timestamp=stored_at + timedelta(microseconds=i),
+                    provider=PROVIDER,
+                    commit=False
+                )
+                for i, (current_price, predicted_price, confidence) in enumerate(predictions)
+            ]
+            db.session.flush()  # Assign ids before the single commit
+            record_ids = [record.id for record in records]
+            db.session.commit()
+            return record_ids
+        except Exception as e:
+            logger.error(f"Database error: {str(e)}", exc_info=True)
+            db.session.rollback()
+            return [None] * len(predictions)
+
+# Concurrent /check replies store their prediction rows in one batch per drain window
+_prediction_writer = BatchWriter(_db_store_predictions)
+
+def _db_update_accuracy(record_id: int, accuracy: float) -> bool:
+    """Record prediction feedback (runs in a worker thread)"""
+    with app.app_context():
+        return PriceHistory.update_prediction_accuracy(record_id, accuracy)
+
+def calculate_prediction(hourly_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Simple prediction: 5% change based on trend"""
+    current_price = float(hourly_data.get('price', 0))
+    trend = hourly_data.get('trend', 'stable')
+    if trend == 'rising':
+        predicted_price = round(current_price * 1.05, 1)
+    elif trend == 'falling':
+        predicted_price = round(current_price * 0.95, 1)
+    else:
+        predicted_price = round(current_price, 1)
+
+    return {
+        "current_price": current_price,
+        "trend": trend,
+        "predicted_price": predicted_price
+    }
+
+async def fetch_prediction() -> Dict[str, Any]:
+    """Fetch the hourly price, compute a prediction, and cache it"""
+    global _cached_prediction
+    hourly_data = await PriceMonitor.check_hourly_price()
+    prediction = calculate_prediction(hourly_data)
+    _cached_prediction = (time.monotonic(), prediction)
+    return prediction
+
+async def refresh_prediction() -> Dict[str, Any]:
+    """Run fetch_prediction, joining a refresh that is already in flight"""
+    key = (PROVIDER, int(time.time() // 60))
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(fetch_prediction())
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shield so a cancelled caller does not cancel the shared refresh
+    return await asyncio.shield(future)
+
+async def get_prediction() -> Dict[str, Any]:
+    """Return the prefetched prediction, refreshing it if it is stale"""
+    if _cached_prediction and time.monotonic() - _cached_prediction[0] < PREDICTION_TTL:
+        return _cached_prediction[1]
+    return await refresh_prediction()
+
+async def prefetch_prediction(context: ContextTypes.DEFAULT_TYPE):
+    """Job callback that refreshes the cached prediction before users ask"""
+    try:
+        await refresh_prediction()
+    except Exception as e:
+        logger.error(f"Prediction prefetch error: {str(e)}", exc_info=True)
+
 async def handle_feedback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process user feedback on predictions"""
     query = update.callback_query
     await query.answer()
 
     try:
-        # Extract feedback data
-        feedback_type, record_id = query.data.split('_')[1:]
+        # Extract feedback data matched by FEEDBACK_PATTERN
+        feedback_type, record_id = context.matches[0].groups()
         accuracy = 1.0 if feedback_type == 'accurate' else 0.0
         
-        # Update database
-        with app.app_context():
-            record = PriceHistory.query.get(int(record_id))
-            if record:
-                record.prediction_accuracy = accuracy
-                db.session.commit()
-                message = "✅ Thanks for your feedback!"
-            else:
-                message = "❌ Could not process feedback"
+        # Update database without blocking the event loop
+        if await asyncio.to_thread(_db_update_accuracy, int(record_id), accuracy):
+            message = "✅ Thanks for your feedback!"
+        else:
+            message = "❌ Could not process feedback"
                 
         await query.edit_message_reply_markup(reply_markup=None)
         await context.bot.send_message(
@@ -75,33 +180,16 @@ async def check_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         await update.message.reply_text("🔍 Checking prices...")
         
-        # Get price data
-        hourly_data = await PriceMonitor.check_hourly_price()
-        current_price = float(hourly_data.get('price', 0))
-        
-        # Simple prediction: 5% change based on trend
-        trend = hourly_data.get('trend', 'stable')
-        if trend == 'rising':
-            predicted_price = round(current_price * 1.05, 1)
-        elif trend == 'falling':
-            predicted_price = round(current_price * 0.95, 1)
-        else:
-            predicted_price = round(current_price, 1)
-        
-        # Store in database
-        price_record = None
-        with app.app_context():
-            try:
-                price_record = PriceHistory(
-                    hourly_price=current_price,
-                    predicted_price=predicted_price,
-                    prediction_confidence=70  # Fixed confidence for now
-                )
-                db.session.add(price_record)
-                db.session.commit()
-            except Exception as e:
-                logger.error(f"Database error: {str(e)}", exc_info=True)
-                db.session.rollback()
+        # Get the prefetched prediction (fetched on demand if stale)
+        prediction = await get_prediction()
+        current_price = prediction["current_price"]
+        trend = prediction["trend"]
+        predicted_price = prediction["predicted_price"]
+
+        # Each reply gets its own stored row so every user's feedback is kept
+        record_id = await _prediction_writer.submit(
+            (current_price, predicted_price, 70)  # Fixed confidence for now
+        )
         
         # Format message
         message = (
@@ -109,14 +197,14 @@ async def check_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
             f"Current Price: {current_price}¢\n"
             f"Trend: {trend.capitalize()}\n"
             f"Predicted Next Hour: {predicted_price}¢\n\n"
-            f"⏰ Updated: {datetime.now(ZoneInfo('America/Chicago')).strftime('%I:%M %p %Z')}"
+            f"⏰ Updated: {datetime.now(CST).strftime('%I:%M %p %Z')}"
         )
         
         # Add feedback buttons if prediction was stored
-        if price_record and price_record.id:
+        if record_id:
             keyboard = [[
-                InlineKeyboardButton("✅ Good", callback_data=f"feedback_accurate_{price_record.id}"),
-                InlineKeyboardButton("❌ Poor", callback_data=f"feedback_inaccurate_{price_record.id}")
+                InlineKeyboardButton("✅ Good", callback_data=f"feedback_accurate_{record_id}"),
+                InlineKeyboardButton("❌ Poor", callback_data=f"feedback_inaccurate_{record_id}")
             ]]
             await update.message.reply_text(
                 message,
@@ -130,17 +218,28 @@ async def check_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
         logger.error(error_msg, exc_info=True)
         await update.message.reply_text(error_msg)
 
+async def shutdown(application: Application):
+    """Release pooled HTTP connections when the bot stops."""
+    await PriceMonitor.close()
+
 def main():
     """Start the bot"""
     try:
         # Create application
-        application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_shutdown(shutdown).build()
 
         # Add handlers
         application.add_handler(CommandHandler("start", start))
         application.add_handler(CommandHandler("help", help_command))
         application.add_handler(CommandHandler("check", check_price))
-        application.add_handler(CallbackQueryHandler(handle_feedback))
+        application.add_handler(CallbackQueryHandler(handle_feedback, pattern=FEEDBACK_PATTERN))
+
+        # Keep the prediction cache warm ahead of the on-the-hour rush
+        application.job_queue.run_repeating(
+            prefetch_prediction,
+            interval=PREFETCH_INTERVAL,
+            first=0
+        )
 
         # Start polling
         logger.info("Starting bot...")
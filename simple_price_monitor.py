@@ -1,11 +1,11 @@
 import os
 import logging
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
+from utils.http_client import HTTP_TIMEOUT, pooled_session
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +14,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# The pricing table and the hourly API share a host, so the second call reuses the first's connection
+_session = pooled_session()
+
 @dataclass
 class PriceData:
     """Simple data class to hold price information"""
@@ -61,7 +64,7 @@ class SimplePriceMonitor:
         """Fetch current price data from ComEd"""
         try:
             # Get the current hour's price from the pricing table
-            response = requests.get(self.pricing_table_url)
+            response = _session.get(self.pricing_table_url, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -103,7 +106,7 @@ class SimplePriceMonitor:
             )
 
             # Get hourly average
-            avg_response = requests.get(f"{self.hourly_api_url}?type=currenthouraverage")
+            avg_response = _session.get(f"{self.hourly_api_url}?type=currenthouraverage", timeout=HTTP_TIMEOUT)
             avg_response.raise_for_status()
             avg_data = avg_response.json()
             hourly_average = float(avg_data[0]['price']) if avg_data else None
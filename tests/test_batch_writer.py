@@ -0,0 +1,35 @@
+import asyncio
+import threading
+import unittest
+from utils.batch_writer import BatchWriter
+
+class TestBatchWriter(unittest.TestCase):
+    def test_concurrent_submits_share_one_write(self):
+        """Test items submitted within one window are written together, off the event loop"""
+        batches = []
+
+        def write(items):
+            batches.append((list(items), threading.current_thread() is threading.main_thread()))
+            return [item * 10 for item in items]
+
+        async def run():
+            writer = BatchWriter(write, window=0.01)
+            return await asyncio.gather(*(writer.submit(i) for i in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [0, 10, 20, 30, 40])
+        self.assertEqual(batches, [([0, 1, 2, 3, 4], False)])
+
+    def test_failed_write_reaches_every_caller(self):
+        """Test an exception from the write function is raised to each submitter"""
+        def write(items):
+            raise RuntimeError("database unavailable")
+
+        async def run():
+            writer = BatchWriter(write, window=0.01)
+            return await asyncio.gather(writer.submit(1), writer.submit(2), return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+if __name__ == '__main__':
+    unittest.main()
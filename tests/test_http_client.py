@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+import aiohttp
+from utils.http_client import RateLimiter, get_json, retire_session, MAX_RETRIES
+
+def _response(status, headers=None, body=None):
+    response = MagicMock(status=status, headers=headers or {})
+    response.read = AsyncMock(return_value=json.dumps(body).encode())
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock(return_value=False)
+    return response
+
+class TestHttpClient(unittest.TestCase):
+    def test_rate_limiter_spacing(self):
+        """Test concurrent callers are spaced out by the limiter interval"""
+        limiter = RateLimiter(50)
+
+        async def acquire():
+            async with limiter:
+                return time.monotonic()
+
+        async def run():
+            return await asyncio.gather(*(acquire() for _ in range(4)))
+
+        times = asyncio.run(run())
+        self.assertGreaterEqual(times[-1] - times[0], 3 * 0.02 * 0.9)
+
+    def test_get_json_retries_after_429(self):
+        """Test a 429 is retried after Retry-After and the next 200 body is returned"""
+        session = MagicMock()
+        session.get.side_effect = [_response(429, {"Retry-After": "0"}), _response(200, body=[{"price": "3.1"}])]
+
+        data = asyncio.run(get_json(session, "https://example.test/api", RateLimiter(1000)))
+
+        self.assertEqual(data, [{"price": "3.1"}])
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_get_json_gives_up(self):
+        """Test persistent 429s and other errors return None"""
+        session = MagicMock()
+        session.get.side_effect = [_response(429, {"Retry-After": "0"}) for _ in range(MAX_RETRIES + 1)]
+        self.assertIsNone(asyncio.run(get_json(session, "https://example.test/api", RateLimiter(1000))))
+        self.assertEqual(session.get.call_count, MAX_RETRIES + 1)
+
+        session.get.side_effect = [_response(500)]
+        self.assertIsNone(asyncio.run(get_json(session, "https://example.test/api", RateLimiter(1000))))
+
+    def test_retire_session_from_finished_loop(self):
+        """Test a session left behind by a finished event loop is detached, not leaked"""
+        async def open_session():
+            return aiohttp.ClientSession(), asyncio.get_running_loop()
+
+        session, loop = asyncio.run(open_session())
+        with self.assertLogs("utils.http_client", level="WARNING"):
+            retire_session(session, loop)
+
+        self.assertTrue(session.closed)
+        self.assertIsNone(session.connector)
+
+    def test_retire_session_on_running_loop(self):
+        """Test a session whose loop still runs in another thread is closed on that loop"""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            async def open_session():
+                return aiohttp.ClientSession()
+
+            session = asyncio.run_coroutine_threadsafe(open_session(), loop).result(timeout=5)
+            connector = session.connector
+            retire_session(session, loop)
+            # The close is queued behind this no-op, so once it is done the close has run
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=5)
+
+            self.assertTrue(connector.closed)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+if __name__ == '__main__':
+    unittest.main()
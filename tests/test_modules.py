@@ -1,12 +1,17 @@
 import asyncio
 import unittest
+import numpy as np
+from unittest.mock import AsyncMock, patch
 from datetime import datetime, timedelta
 from modules import (
     ModuleManager, 
     PriceMonitorModule, 
     PatternAnalysisModule,
-    MLPredictionModule
+    MLPredictionModule,
+    DashboardModule
 )
+from modules.ml_prediction_module import MIN_FIT_INTERVAL, MODEL_REFIT_INTERVAL
+from modules.price_series import PriceSeries
 
 class TestModuleSystem(unittest.TestCase):
     def setUp(self):
@@ -160,6 +165,256 @@ class TestModuleSystem(unittest.TestCase):
             self.assertIn("confidence", notif_data)
             self.assertIn("timestamp", notif_data)
 
+    def test_module_status_cache(self):
+        """Test status is reused while unchanged and rebuilt after a state change"""
+        first = self.pattern_module.get_status()
+        self.assertIs(self.pattern_module.get_status(), first)
+
+        self.pattern_module.enable()
+        status = self.pattern_module.get_status()
+        self.assertIsNot(status, first)
+        self.assertTrue(status["enabled"])
+        self.assertEqual(status["status"], "enabled")
+
+    def test_dashboard_price_trends(self):
+        """Test price trends older than 24 hours are dropped as new alerts arrive"""
+        dashboard = DashboardModule()
+        for hours_ago, price in [(30, 1.0), (2, 2.0), (1, 3.0)]:
+            dashboard.latest_price_data = {
+                'price': price,
+                'timestamp': datetime.now() - timedelta(hours=hours_ago)
+            }
+            asyncio.run(dashboard.process({'price_alert': True}))
+
+        self.assertEqual([t['price'] for t in dashboard.metrics['price_trends']], [2.0, 3.0])
+        self.assertIsInstance(dashboard.metrics['price_trends'], list)
+        self.assertEqual(dashboard._get_price_trend_summary(), {"trend": "up", "change": 50.0})
+
+    def test_dashboard_out_of_order_trends(self):
+        """Test late, out-of-order ticks are slotted by timestamp and still pruned"""
+        dashboard = DashboardModule()
+        for hours_ago, price in [(2, 2.0), (1, 3.0), (30, 1.0), (3, 4.0)]:
+            dashboard.latest_price_data = {
+                'price': price,
+                'timestamp': datetime.now() - timedelta(hours=hours_ago)
+            }
+            asyncio.run(dashboard.process({'price_alert': True}))
+
+        self.assertEqual([t['price'] for t in dashboard.metrics['price_trends']], [4.0, 2.0, 3.0])
+        self.assertEqual(dashboard._get_price_trend_summary(), {"trend": "down", "change": -25.0})
+
+    async def async_test_admin_notification_batching(self):
+        """Send a burst of errors and let the batching sender flush it"""
+        bot = AsyncMock()
+        self.pattern_module.admin_chat_id = "admin"
+        self.pattern_module.set_bot(bot)
+        for i in range(3):
+            await self.pattern_module.record_error(f"failure {i}")
+        await self.pattern_module._admin_sender
+        return bot
+
+    def test_admin_notification_batching(self):
+        """Test a burst of module errors reaches the admin as a single message"""
+        with patch('modules.base_module.ADMIN_BATCH_WINDOW', 0.05):
+            bot = asyncio.run(self.async_test_admin_notification_batching())
+
+        bot.send_message.assert_awaited_once()
+        text = bot.send_message.call_args.kwargs["text"]
+        for i in range(3):
+            self.assertIn(f"failure {i}", text)
+
+    def test_process_with_enabled_modules_concurrent(self):
+        """Test modules run concurrently and a price_monitor failure raises after recording the rest"""
+        for module in (self.price_module, self.pattern_module):
+            self.module_manager.register_module(module)
+            self.module_manager.enable_module(module.name)
+
+        async def slow_result(data):
+            await asyncio.sleep(0.05)
+            return {"status": "success"}
+
+        with patch.object(PatternAnalysisModule, 'process', side_effect=slow_result), \
+             patch.object(PriceMonitorModule, 'process', side_effect=slow_result):
+            started = asyncio.run(asyncio.wait_for(self.module_manager.process_with_enabled_modules({}), 0.09))
+        self.assertEqual(set(started), {"price_monitor", "pattern_analysis"})
+
+        with patch.object(PatternAnalysisModule, 'process', side_effect=slow_result), \
+             patch.object(PriceMonitorModule, 'process', side_effect=ValueError("feed down")):
+            with self.assertRaises(ValueError):
+                asyncio.run(self.module_manager.process_with_enabled_modules({}))
+        self.assertEqual(len(self.module_manager.module_errors["price_monitor"]), 1)
+        self.assertEqual(self.module_manager.module_errors["pattern_analysis"], [])
+
+    def test_ml_window_features(self):
+        """Test vectorized window features match the per-window computation"""
+        prices = [2.5 + (i % 24) * 0.1 + (i % 5) * 0.03 for i in range(60)]
+        expected = []
+        for i in range(len(prices) - 24):
+            window = prices[i:i + 24]
+            expected.append([
+                np.mean(window), np.std(window), np.min(window), np.max(window),
+                window[-1], window[-1] - window[0], np.mean(window[-6:]), np.mean(prices[:i + 24])
+            ])
+
+        np.testing.assert_allclose(self.ml_module._prepare_features(prices), expected)
+        np.testing.assert_allclose(self.ml_module._prepare_targets(prices), prices[24:])
+        self.assertEqual(self.ml_module._window_features(prices[-24:]).shape, (1, 8))
+
+    def test_price_series(self):
+        """Test the price series grows past its capacity and prunes by timestamp"""
+        series = PriceSeries(capacity=2)
+        now = datetime.now()
+        for hours_ago in (30, 2, 40, 1):
+            series.append(float(hours_ago), now - timedelta(hours=hours_ago))
+
+        series.prune(now - timedelta(hours=24))
+        self.assertEqual(series.prices.tolist(), [2.0, 1.0])
+        self.assertEqual(series.last_timestamp(), now - timedelta(hours=1))
+
+    def test_determine_trend(self):
+        """Test trend labels for rising, falling and mixed recent prices"""
+        now = datetime.now()
+        cases = [([1.0, 2.0, 3.0], "rising"), ([3.0, 2.0, 1.0], "falling"),
+                 ([1.0, 3.0, 2.0], "stable"), ([2.0, 2.0], "stable"), ([4.0, 1.0, 2.0, 3.0], "rising")]
+        for prices, expected in cases:
+            module = PatternAnalysisModule()
+            for i, price in enumerate(prices):
+                module.price_history.append(price, now - timedelta(hours=len(prices) - i))
+            self.assertEqual(module._determine_trend(), expected)
+
+    def test_cyclic_pattern_detection(self):
+        """Test 6- and 8-hour cycles are detected regardless of phase while a steady ramp is not"""
+        now = datetime.now()
+        hours = np.arange(24)
+        series = {
+            "cycle": 3.0 + 0.5 * np.sin(2 * np.pi * hours / 6),
+            "shifted_cycle": 3.0 + 0.5 * np.sin(2 * np.pi * (hours + 2.5) / 6),
+            "eight_hour_cycle": 3.0 + 0.5 * np.sin(2 * np.pi * hours / 8),
+            "ramp": 2.0 + 0.05 * hours,
+        }
+        detected = {}
+        for name, prices in series.items():
+            module = PatternAnalysisModule()
+            for i, price in enumerate(prices):
+                module.price_history.append(float(price), now - timedelta(hours=24 - i))
+            detected[name] = "cyclic_pattern" in module._detect_patterns()["detected"]
+
+        self.assertEqual(detected, {"cycle": True, "shifted_cycle": True, "eight_hour_cycle": True, "ramp": False})
+
+    def test_ml_refit_throttled(self):
+        """Test refits wait for both the tick interval and the minimum time since the last fit"""
+        now = datetime.now()
+        for i in range(48):
+            self.ml_module.price_history.append(2.5 + (i % 24) * 0.1, now - timedelta(hours=48 - i))
+
+        with patch.object(self.ml_module.model, 'fit') as mock_fit:
+            self.ml_module._update_model()
+            for _ in range(MODEL_REFIT_INTERVAL):
+                self.ml_module._update_model()
+            self.assertEqual(mock_fit.call_count, 1)
+
+            self.ml_module._last_fit_time -= MIN_FIT_INTERVAL
+            self.ml_module._update_model()
+            self.assertEqual(mock_fit.call_count, 2)
+
+    def test_ml_prediction_extrapolation(self):
+        """Test full predictions run every few ticks with linear extrapolation in between"""
+        full_predictions = iter([2.0, 3.0, 5.0])
+        with patch.object(MLPredictionModule, '_predict_cached', lambda module, X: next(full_predictions)):
+            predictions = [self.ml_module._next_prediction(None) for _ in range(6)]
+
+        self.assertEqual(predictions, [2.0, 3.0, 3.25, 3.5, 3.75, 5.0])
+
+    def test_ml_trend_with_numpy_prices(self):
+        """Test NumPy scalar prices classify the trend instead of failing the tick"""
+        now = datetime.now()
+        with patch.object(MLPredictionModule, '_update_model'), \
+             patch.object(MLPredictionModule, '_next_prediction', return_value=3.0):
+            for i in range(48):
+                result = asyncio.run(self.ml_module.process({
+                    'current_price': np.float64(2.5), 'timestamp': now - timedelta(hours=48 - i)
+                }))
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["predictions"]["trend"], "rising")
+
+    def test_price_monitor_session_per_loop(self):
+        """Test a new event loop gets a fresh session and the previous one is closed"""
+        from modules import price_monitor_module
+
+        async def current_session():
+            return price_monitor_module._get_session()
+
+        first = asyncio.run(current_session())
+        second = asyncio.run(current_session())
+        asyncio.run(PriceMonitorModule.close())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+
+    def test_price_monitor_feed_cache(self):
+        """Test a feed fetched in one update cycle is reused rather than requested again"""
+        with patch('modules.price_monitor_module._fetch_json', new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [{"price": "3.2", "millisUTC": "0"}]
+            asyncio.run(self.price_module.process({"command": "check_price"}))
+            asyncio.run(self.price_module.get_price_data())
+
+        requested = [call.args[0] for call in mock_fetch.call_args_list]
+        self.assertEqual(sorted(requested), sorted(set(requested)))
+
+    def test_price_monitor_commands_share_fetches(self):
+        """Test process, notification and price data requested together hit each feed once"""
+        async def slow_fetch(url):
+            await asyncio.sleep(0.01)
+            return [{"price": "3.2", "millisUTC": "0"}]
+
+        async def handle_update():
+            return await asyncio.gather(
+                self.price_module.process({}),
+                self.price_module.get_notification_data(),
+                self.price_module.get_price_data()
+            )
+
+        with patch('modules.price_monitor_module._fetch_json', side_effect=slow_fetch) as mock_fetch:
+            processed, notification, price_data = asyncio.run(handle_update())
+
+        requested = sorted(call.args[0] for call in mock_fetch.call_args_list)
+        self.assertEqual(requested, sorted(
+            [self.price_module.api_endpoints["hourly"], self.price_module.api_endpoints["5min"]]
+        ))
+        self.assertEqual(processed["current_price"], 3.2)
+        self.assertEqual(notification["current_price"], 3.2)
+        self.assertEqual(price_data["average_price"], 3.2)
+
+    def test_price_monitor_feed_failure_isolated(self):
+        """Test a failing 5-minute feed leaves the hourly result intact"""
+        async def fetch(url):
+            if url == self.price_module.api_endpoints["5min"]:
+                raise ConnectionError("5min feed down")
+            return [{"price": "3.2", "millisUTC": "0"}]
+
+        with patch('modules.price_monitor_module._fetch_json', side_effect=fetch):
+            result = asyncio.run(self.price_module.process({}))
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["hourly_data"], [{"price": "3.2", "millisUTC": "0"}])
+        self.assertEqual(result["five_min_data"], [])
+
+    def test_price_monitor_feed_single_flight(self):
+        """Test concurrent requests for an uncached feed share one fetch"""
+        async def slow_fetch(url):
+            await asyncio.sleep(0.01)
+            return [{"price": "3.2"}]
+
+        async def fetch_concurrently():
+            return await asyncio.gather(*(self.price_module._fetch_feed("5min") for _ in range(3)))
+
+        with patch('modules.price_monitor_module._fetch_json', side_effect=slow_fetch) as mock_fetch:
+            results = asyncio.run(fetch_concurrently())
+
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(results, [[{"price": "3.2"}]] * 3)
+
     def test_price_monitor(self):
         """Runner for async price monitor tests"""
         asyncio.run(self.async_test_price_monitor())
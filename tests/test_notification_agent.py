@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+from agents.notification_agent import NotificationAgent
+
+class TestNotificationAgent(unittest.TestCase):
+    def test_burst_is_stored_in_one_batch(self):
+        """Test notifications queued within the drain window are stored with one call, then all sent"""
+        notifications = [
+            {
+                "price_data": {"hourly_data": {"price": 3.0 + i}},
+                "prediction": {"short_term_prediction": 3.5, "confidence": 70}
+            }
+            for i in range(3)
+        ]
+        stored = []
+
+        def store(agent, batch):
+            stored.append(len(batch))
+            for notification in batch:
+                notification["price_record_id"] = 1
+
+        async def run():
+            agent = NotificationAgent()
+            agent.bot = AsyncMock()
+            for notification in notifications:
+                await agent.queue_notification(notification)
+            await agent._drain_task
+            return agent
+
+        with patch.object(NotificationAgent, 'store_predictions', store):
+            agent = asyncio.run(run())
+
+        self.assertEqual(stored, [3])
+        self.assertEqual(agent.bot.send_message.call_count, 3)
+        self.assertEqual(agent.notification_queue, [])
+
+if __name__ == '__main__':
+    unittest.main()
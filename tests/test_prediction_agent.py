@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import numpy as np
+from agents.prediction_agent import PricePredictionAgent
+
+class TestPricePredictionAgent(unittest.TestCase):
+    def setUp(self):
+        self.agent = PricePredictionAgent()
+        self.prediction = {
+            "short_term_prediction": 2.5,
+            "confidence": 60.0,
+            "trend": "stable",
+            "feedback_quality": None
+        }
+
+    def test_weighted_moving_average(self):
+        """Test cached exponential weights match a freshly computed weighted average"""
+        prices = [3.0, 2.8, 2.9, 3.1, 2.7, 2.6, 2.5, 2.9, 3.0, 3.2, 3.3, 3.1, 2.4, 2.2]
+        for decay in (0.2, 0.3, 0.4):
+            for size in (1, 5, len(prices)):
+                window = prices[:min(size, 12)]
+                expected_weights = np.exp(-np.arange(len(window)) * decay)
+                expected = np.average(window, weights=expected_weights / expected_weights.sum())
+                result = self.agent._calculate_weighted_moving_average(prices[:size], {"historical": decay})
+                self.assertAlmostEqual(result, expected)
+
+    def test_single_price_prediction(self):
+        """Test a single data point yields a stable, unchanged prediction"""
+        result = self.agent.predict_future_prices([3.4], [])
+        self.assertEqual(result["trend"], "stable")
+        self.assertEqual(result["short_term_prediction"], 3.4)
+
+        limited = self.agent.get_limited_prediction([3.0, 2.0, 2.5])
+        self.assertEqual(limited["trend"], "rising")
+        self.assertEqual(limited["short_term_prediction"], 3.06)
+
+    def test_prediction_with_history_and_feedback(self):
+        """Test a multi-point history with feedback produces a full prediction"""
+        prices = [3.2, 3.0, 2.9, 3.1, 2.8, 2.7]
+        feedback = [SimpleNamespace(prediction_accuracy=a) for a in (1.0, 0.0, 1.0, None)]
+
+        result = self.agent.predict_future_prices(prices, feedback)
+
+        self.assertEqual(result["trend"], "rising")
+        self.assertAlmostEqual(result["feedback_quality"], 66.7)
+        self.assertGreater(result["confidence"], 50.0)
+        self.assertIsInstance(result["short_term_prediction"], float)
+
+        no_feedback = self.agent.predict_future_prices(prices, [])
+        self.assertEqual(no_feedback["confidence"], 50.0)
+        self.assertIsNone(no_feedback["feedback_quality"])
+
+    def test_prediction_is_cached(self):
+        """Test repeated requests within the cache window reuse the stored prediction"""
+        with patch.object(self.agent, '_predict_and_store', return_value=self.prediction) as mock_predict:
+            first = asyncio.run(self.agent.process({"command": "predict_prices"}))
+            second = asyncio.run(self.agent.process({"command": "predict_prices"}))
+
+        self.assertEqual(mock_predict.call_count, 1)
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(first["predictions"], second["predictions"])
+
+    def test_prediction_cache_expires(self):
+        """Test a new cache window triggers a fresh prediction"""
+        with patch.object(self.agent, '_predict_and_store', return_value=self.prediction) as mock_predict, \
+             patch('agents.prediction_agent.time.time', side_effect=[0.0, 600.0]):
+            asyncio.run(self.agent.process({"command": "predict_prices"}))
+            asyncio.run(self.agent.process({"command": "predict_prices"}))
+
+        self.assertEqual(mock_predict.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
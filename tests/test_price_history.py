@@ -0,0 +1,150 @@
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import text
+from models import PriceHistory, db, _pearson_from_sums
+from app import app
+
+class TestPriceHistory(unittest.TestCase):
+    def setUp(self):
+        self.app_context = app.app_context()
+        self.app_context.push()
+        self.provider = "TestProvider"
+
+    def tearDown(self):
+        PriceHistory.query.filter_by(provider=self.provider).delete()
+        db.session.commit()
+        self.app_context.pop()
+
+    def _add(self, price, age, **kwargs):
+        return PriceHistory.add_price_data(
+            hourly_price=price,
+            timestamp=datetime.utcnow() - age,
+            provider=self.provider,
+            **kwargs
+        )
+
+    def test_recent_prices_window(self):
+        """Test recent prices cover a half-open window ending now, newest first"""
+        self._add(2.0, timedelta(hours=2))
+        self._add(3.0, timedelta(hours=1))
+        self._add(9.0, timedelta(hours=30))  # Older than the window
+        self._add(8.0, -timedelta(hours=1))  # Not yet current
+
+        self.assertEqual(PriceHistory.get_recent_prices(provider=self.provider), [3.0, 2.0])
+
+    def test_recent_window_includes_cutoff_hour(self):
+        """Test a row just inside the window start is returned, even though it shares the cutoff's hour"""
+        self._add(4.0, timedelta(hours=24) - timedelta(minutes=1))
+
+        self.assertEqual(PriceHistory.get_recent_prices(provider=self.provider), [4.0])
+        self.assertEqual([r.hourly_price for r in PriceHistory.get_recent_history(provider=self.provider)], [4.0])
+
+    def test_add_price_data_bulk(self):
+        """Test bulk inserts store every record in one call"""
+        now = datetime.utcnow()
+        records = [
+            {"hourly_price": 2.0 + i, "timestamp": now - timedelta(hours=i + 1), "provider": self.provider}
+            for i in range(3)
+        ]
+        self.assertEqual(PriceHistory.add_price_data_bulk(records), 3)
+        self.assertEqual(PriceHistory.add_price_data_bulk([]), 0)
+        self.assertEqual(PriceHistory.get_recent_prices(provider=self.provider), [2.0, 3.0, 4.0])
+
+    def test_add_price_data_bulk_upserts(self):
+        """Test a replayed tick updates its row instead of inserting a duplicate"""
+        ts = datetime.utcnow() - timedelta(hours=1)
+        PriceHistory.add_price_data_bulk([
+            {"hourly_price": 2.0, "hourly_average": 2.5, "timestamp": ts, "provider": self.provider}
+        ])
+        PriceHistory.add_price_data_bulk([{"hourly_price": 3.0, "timestamp": ts, "provider": self.provider}])
+
+        rows = PriceHistory.get_recent_history(provider=self.provider)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].hourly_price, 3.0)
+        self.assertEqual(rows[0].hourly_average, 2.5)
+
+    def test_update_prediction_accuracy(self):
+        """Test feedback updates the stored record and reports missing ids"""
+        record = self._add(3.0, timedelta(hours=1))
+        self.assertTrue(PriceHistory.update_prediction_accuracy(record.id, 1.0))
+        self.assertEqual(db.session.get(PriceHistory, record.id).prediction_accuracy, 1.0)
+        self.assertFalse(PriceHistory.update_prediction_accuracy(record.id + 1000, 0.0))
+
+    def test_prediction_feedback_stats(self):
+        """Test feedback stats aggregated in SQL match the row-by-row numbers"""
+        accuracies = [1.0, 0.0, 1.0, 1.0]
+        confidences = [80.0, 40.0, None, 90.0]
+        for i, (acc, conf) in enumerate(zip(accuracies, confidences)):
+            record = self._add(3.0, timedelta(hours=i + 1), prediction_confidence=conf)
+            PriceHistory.update_prediction_accuracy(record.id, acc)
+        self._add(3.0, timedelta(hours=1), prediction_confidence=50.0)  # No feedback yet
+
+        stats = PriceHistory.get_prediction_feedback_stats(provider=self.provider)
+        filled = [c or 0.0 for c in confidences]
+        self.assertEqual(stats['total_predictions'], 4)
+        self.assertEqual(stats['feedback_count'], 4)
+        self.assertAlmostEqual(stats['accuracy'], 0.75)
+        self.assertAlmostEqual(stats['confidence_correlation'], np.corrcoef(accuracies, filled)[0, 1])
+
+    def test_running_sums_fallback_keeps_pending_work(self):
+        """Test a missing running-sums table doesn't roll back the caller's session"""
+        record = PriceHistory.add_price_data(
+            hourly_price=3.0, timestamp=datetime.utcnow() - timedelta(hours=1),
+            provider=self.provider, commit=False
+        )
+        now = datetime.utcnow()
+        self.assertIsNone(PriceHistory._feedback_sums_from_running_sums(self.provider, now - timedelta(hours=1), now))
+        self.assertIn(record, db.session)
+        db.session.commit()
+        self.assertEqual(PriceHistory.get_recent_prices(provider=self.provider), [3.0])
+
+    def test_running_sums_match_row_aggregate(self):
+        """Test the running-sums path counts exactly the rows in the window, including partial hours at both ends"""
+        ages = [timedelta(hours=24, minutes=1), timedelta(hours=24) - timedelta(minutes=1),
+                timedelta(hours=12), timedelta(hours=5, minutes=30), timedelta(seconds=30)]
+        for i, age in enumerate(ages):
+            record = self._add(3.0, age, prediction_confidence=50.0 + 10 * i)
+            PriceHistory.update_prediction_accuracy(record.id, float(i % 2))
+
+        # Stand in for the PostgreSQL trigger: hourly sums of every rated row
+        buckets = {}
+        for row in PriceHistory.query.filter_by(provider=self.provider).all():
+            sums = buckets.setdefault(row.timestamp.replace(minute=0, second=0, microsecond=0), [0, 0.0, 0.0, 0.0, 0.0, 0.0])
+            a, c = row.prediction_accuracy, row.prediction_confidence
+            for j, value in enumerate((1, a, c, a * c, a * a, c * c)):
+                sums[j] += value
+        db.session.execute(text(
+            "CREATE TABLE IF NOT EXISTS prediction_feedback_running (provider varchar(50), bucket timestamp, "
+            "n bigint, sum_acc float, sum_conf float, sum_ac float, sum_a2 float, sum_c2 float)"
+        ))
+        for bucket, sums in buckets.items():
+            db.session.execute(
+                text("INSERT INTO prediction_feedback_running VALUES (:p, :b, :n, :a, :c, :ac, :a2, :c2)"),
+                dict(zip(("p", "b", "n", "a", "c", "ac", "a2", "c2"), (self.provider, bucket, *sums)))
+            )
+
+        try:
+            now = datetime.utcnow()
+            start = now - timedelta(hours=24)
+            combined = PriceHistory._feedback_sums_with_running(self.provider, start, now)
+            rows = PriceHistory._feedback_sums(self.provider, start, now)
+            self.assertEqual(combined.n, 4)
+            self.assertEqual(PriceHistory._feedback_stats_from_sums(combined),
+                             PriceHistory._feedback_stats_from_sums(rows))
+        finally:
+            db.session.execute(text("DROP TABLE prediction_feedback_running"))
+
+    def test_pearson_from_sums(self):
+        """Test the closed-form correlation matches numpy"""
+        accuracies = np.array([1.0, 0.0, 1.0, 1.0, 0.0])
+        confidences = np.array([80.0, 40.0, 70.0, 90.0, 55.0])
+        result = _pearson_from_sums(
+            len(accuracies), accuracies.sum(), confidences.sum(), (accuracies * confidences).sum(),
+            (accuracies ** 2).sum(), (confidences ** 2).sum()
+        )
+        self.assertAlmostEqual(result, np.corrcoef(accuracies, confidences)[0, 1])
+        self.assertEqual(_pearson_from_sums(3, 3.0, 210.0, 210.0, 3.0, 14700.0), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Coalesce database writes from concurrent handlers into one batch per drain window"""
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DRAIN_WINDOW = 0.1  # Seconds to collect writes before flushing them as one batch
+
+class BatchWriter:
+    """Queue items and hand each window's worth to a blocking write function in a worker thread
+
+    write receives the queued items in order and returns one result per item (e.g. the new
+    row ids); submit resolves to the result for its own item.
+    """
+
+    __slots__ = ("_write", "_window", "_pending", "_flush_task")
+
+    def __init__(self, write: Callable[[List[Any]], Sequence[Any]], window: float = DRAIN_WINDOW):
+        self._write = write
+        self._window = window
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for the batch containing it to be written"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self._window)
+        # Items queued while this batch is being written start the next window
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        try:
+            results = await asyncio.to_thread(self._write, [item for item, _ in batch])
+        except Exception as e:
+            logger.error(f"Batch write of {len(batch)} items failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
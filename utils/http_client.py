@@ -0,0 +1,83 @@
+"""Pooled and rate-limited HTTP helpers for the upstream price APIs"""
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Optional
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 3  # Retries after a 429 before giving up on a request
+HTTP_TIMEOUT = 10  # Seconds, matching the aiohttp sessions' total timeout
+
+def pooled_session(pool_connections: int = 4, pool_maxsize: int = 8) -> requests.Session:
+    """requests.Session that keeps HTTPS connections alive for reuse across calls"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+    return session
+
+def retire_session(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Let go of a session created on an event loop other than the running one"""
+    if session.closed:
+        return
+    if loop is not None and loop.is_running():
+        # Still serving another thread, so close it on the loop that owns it
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # Its loop has stopped, and closing needs that loop, so detach the connector rather than
+    # close it from here; any pooled connections go with the old loop
+    logger.warning("Detaching HTTP session left behind by a stopped event loop")
+    session.detach()
+
+class RateLimiter:
+    """Async context manager that spaces calls to at most `rate` per second"""
+
+    __slots__ = ("_interval", "_next_slot")
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        # Reserve the next slot before sleeping so concurrent callers queue up behind it
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds (e.g. after a 429)"""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+def _retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else exponential backoff with jitter"""
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return 2 ** attempt + random.random()
+
+async def get_json(session: aiohttp.ClientSession, url: str, limiter: RateLimiter) -> Optional[Any]:
+    """GET a URL through the limiter and decode its JSON body (None on a non-200 reply)"""
+    for attempt in range(MAX_RETRIES + 1):
+        async with limiter:
+            async with session.get(url) as response:
+                if response.status == 429 and attempt < MAX_RETRIES:
+                    delay = _retry_delay(response, attempt)
+                    logger.warning(f"Rate limited by {response.url.host}, retrying in {delay:.1f}s")
+                    limiter.pause(delay)
+                    continue
+                if response.status != 200:
+                    logger.warning(f"GET {url} returned {response.status}")
+                    return None
+                # json.loads detects the UTF encoding itself, so skip aiohttp's text decoding step
+                return json.loads(await response.read())
+    return None